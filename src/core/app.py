@@ -3,28 +3,52 @@ Core application logic for Tabletop Notetaker
 """
 
 import json
+import os
+import queue
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 
-from services.recording_service import RecordingService
-from services.transcription_service import TranscriptionService
+from services.recording_service import RecordingService, SAMPLE_WIDTH
+from services.transcription_service import TranscriptionService, INAUDIBLE_TEXT
 from services.summarization_service import SummarizationService
+from services.cache import TranscriptCache, SummaryCache, SIMILAR_AUDIO_CACHE
+
+
+# Speech segments transcribed concurrently while recording
+LIVE_TRANSCRIPTION_WORKERS = 4
+
+# Buffer size for transcript and summary files, so many small writes become few syscalls
+WRITE_BUFFER_SIZE = 1 << 20
 
 
 class TabletopNotetakerApp:
     """Main application class for Tabletop Notetaker"""
 
-    def __init__(self):
+    def __init__(self, live_transcription: Optional[bool] = None):
         self.recording_service = RecordingService()
         self.transcription_service = TranscriptionService()
-        self.summarization_service = SummarizationService()
+        self.summarization_service = SummarizationService(SummaryCache())
+        self.transcript_cache = TranscriptCache(similar_audio=SIMILAR_AUDIO_CACHE)
         self.is_recording = False
         self.current_recording_path = None
         self.recordings = []
 
+        # Transcribe speech segments during recording, so little is left to do after
+        # stopping. On by default only for the local engine: with Google it would
+        # upload every recording, whether or not a transcript is ever asked for
+        if live_transcription is None:
+            live_transcription = self.transcription_service.engine == "whisper"
+        self.live_transcription = live_transcription
+        self._live_executor = None
+        self._live_feeder = None
+        self._pending = []
+        self._live_path = None
+        self._live_duration = 0.0
+
     def start_recording(self, output_path: Optional[str] = None) -> bool:
         """Start audio recording"""
         try:
@@ -34,8 +58,13 @@ class TabletopNotetakerApp:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 self.current_recording_path = Path(f"recording_{timestamp}.wav")
 
-            self.recording_service.start_recording(str(self.current_recording_path))
+            self._discard_live_transcription()
+            self.recording_service.start_recording(str(self.current_recording_path),
+                                                   segment_speech=self.live_transcription)
             self.is_recording = True
+
+            if self.live_transcription:
+                self._start_live_transcription()
             return True
         except Exception as e:
             print(f"Error starting recording: {e}")
@@ -47,6 +76,10 @@ class TabletopNotetakerApp:
             if self.is_recording:
                 self.recording_service.stop_recording()
                 self.is_recording = False
+                if self._live_executor:
+                    # Remaining segments finish in the background; see _take_live_transcript
+                    self._live_path = self.current_recording_path
+                    self._live_duration = self.recording_service.get_recording_duration()
                 if self.current_recording_path:
                     self.recordings.append(str(self.current_recording_path))
                 return str(self.current_recording_path)
@@ -61,13 +94,177 @@ class TabletopNotetakerApp:
                 print(f"Audio file not found: {audio_path}")
                 return None
 
+            transcript = self._take_live_transcript(audio_path)
+            cache_key, cached = self.transcript_cache.lookup(audio_path, self.transcription_service.model_id)
+            if transcript:
+                self._cache_transcript(cache_key, transcript)
+                return transcript
+
+            if cached:
+                print("Using cached transcript")
+                return dict(cached, file_path=audio_path)
+
             print("Starting transcription...")
             transcript = self.transcription_service.transcribe_with_diarization(audio_path)
+            self._cache_transcript(cache_key, transcript)
             return transcript
         except Exception as e:
             print(f"Error transcribing audio: {e}")
             return None
 
+    def transcribe_and_summarize(self, audio_path: str,
+                                 format_type: str = "txt") -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Transcribe audio file and summarize it, overlapping the two stages.
+        Segments are summarized as the transcription worker produces them, so the
+        summary is ready shortly after the last segment is transcribed.
+        Returns (transcript, summary).
+        """
+        try:
+            if not Path(audio_path).exists():
+                print(f"Audio file not found: {audio_path}")
+                return None, ""
+
+            transcript = self._take_live_transcript(audio_path)
+            cache_key, cached = self.transcript_cache.lookup(audio_path, self.transcription_service.model_id)
+            if transcript:
+                self._cache_transcript(cache_key, transcript)
+            elif cached:
+                print("Using cached transcript")
+                transcript = dict(cached, file_path=audio_path)
+            if transcript:
+                return transcript, self.summarization_service.summarize(transcript, format_type)
+
+            print("Starting transcription...")
+            segments = queue.Queue()
+            summary = self.summarization_service.new_summary()
+
+            def produce():
+                try:
+                    return self.transcription_service.transcribe_with_diarization(
+                        audio_path, on_segment=segments.put)
+                finally:
+                    segments.put(None)  # End of transcript
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(produce)
+                for segment in iter(segments.get, None):
+                    summary.add(segment)
+                transcript = future.result()
+            self._cache_transcript(cache_key, transcript)
+
+            if not transcript.get('segments'):
+                return transcript, "No transcript content to summarize."
+
+            return transcript, self.summarization_service.format_summary(
+                summary.finalize(), transcript, format_type)
+        except Exception as e:
+            print(f"Error transcribing audio: {e}")
+            return None, ""
+
+    def _cache_transcript(self, cache_key: str, transcript: Dict[str, Any]):
+        """Cache a transcript unless transcription failed or heard nothing, so it is retried"""
+        failed = 'error' in transcript or any(
+            segment.get('speaker') == 'Error' or segment.get('text') == INAUDIBLE_TEXT
+            for segment in transcript.get('segments', []))
+        if not failed:
+            self.transcript_cache.set(cache_key, transcript)
+
+    def _start_live_transcription(self):
+        """Start transcribing speech segments from the recording as they close"""
+        self._pending = []
+        self._live_executor = ThreadPoolExecutor(max_workers=LIVE_TRANSCRIPTION_WORKERS + 1,
+                                                 thread_name_prefix="live-transcription")
+        self._live_feeder = self._live_executor.submit(self._feed_live_chunks, self.recording_service.chunk_queue,
+                                                       self._live_executor, self._pending)
+
+    def _feed_live_chunks(self, chunk_queue: queue.Queue, executor: ThreadPoolExecutor, pending: List[Future]):
+        """
+        Submit each segment put on chunk_queue for transcription, adding its future to pending.
+        Handed this recording's queue, executor and list, since by the time a segment
+        arrives the attributes on self may already belong to the next recording.
+        """
+        for start, end, pcm in iter(chunk_queue.get, None):
+            try:
+                pending.append(executor.submit(self._transcribe_live_chunk, start, end, pcm))
+            except RuntimeError:  # Executor shut down; this recording was discarded
+                return
+
+    def _transcribe_live_chunk(self, start: float, end: float, pcm: bytes) -> Optional[Dict[str, Any]]:
+        """Transcribe one recorded speech segment"""
+        text = self.transcription_service.transcribe_chunk(pcm, self.recording_service.sample_rate, SAMPLE_WIDTH)
+        if not text:
+            return None
+
+        return {
+            'start': start,
+            'end': end,
+            'speaker': 'Speaker 1',  # Default speaker
+            'text': text,
+            'confidence': 0.8  # Estimated confidence
+        }
+
+    def _take_live_transcript(self, audio_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the transcript built while audio_path was being recorded, waiting for
+        any segments still in flight. Returns None if there is none, or if any
+        segment failed, so the caller falls back to transcribing the file.
+        """
+        if not self._live_executor or self.is_recording or not self._live_path:
+            return None
+        if Path(audio_path).resolve() != self._live_path.resolve():
+            return None
+
+        segments = []
+        failed = False
+        try:
+            self._live_feeder.result()
+            for future in as_completed(self._pending):
+                try:
+                    segment = future.result()
+                except Exception as e:
+                    print(f"Live transcription error: {e}")
+                    failed = True
+                    continue
+                if segment:
+                    segments.append(segment)
+        finally:
+            self._discard_live_transcription()
+
+        if failed or not segments:
+            return None
+
+        segments.sort(key=lambda segment: segment['start'])
+        return {
+            'file_path': audio_path,
+            'duration': self._live_duration,
+            'timestamp': datetime.now().isoformat(),
+            'segments': segments
+        }
+
+    def _discard_live_transcription(self):
+        """Drop live transcription state without waiting for it"""
+        # Queued chunk jobs are cancelled so they neither compete with the next
+        # recording nor hold up interpreter exit; at most the running ones finish
+        for future in self._pending:
+            future.cancel()
+        if self._live_executor:
+            try:
+                self._live_executor.shutdown(wait=False, cancel_futures=True)
+            except TypeError:  # Python 3.8 has no cancel_futures
+                self._live_executor.shutdown(wait=False)
+        self._live_executor = None
+        self._live_feeder = None
+        self._pending = []
+        self._live_path = None
+
+    def close(self):
+        """Stop recording and any background transcription before the app exits"""
+        if self.is_recording:
+            self.stop_recording()
+        self.transcription_service.cancel()
+        self._discard_live_transcription()
+
     def summarize_transcript(self, transcript: Dict[str, Any], format_type: str = "txt") -> str:
         """Summarize transcript into notes"""
         try:
@@ -77,56 +274,86 @@ class TabletopNotetakerApp:
             print(f"Error summarizing transcript: {e}")
             return ""
 
+    def save_summary(self, transcript: Dict[str, Any], output_path: str, format_type: str = "txt") -> bool:
+        """Summarize transcript straight into a file in the specified format"""
+        tmp_path = Path(f"{output_path}.tmp")
+        try:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+            # Stream into a temporary file and swap it in only once the summary is
+            # complete, so a failure never leaves a partial file over the old one
+            with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                self.summarization_service.write_summary(transcript, format_type, f)
+            os.replace(tmp_path, output_path)
+            return True
+        except Exception as e:
+            print(f"Error summarizing transcript: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
     def save_transcript(self, transcript: Dict[str, Any], output_path: str, format_type: str = "txt"):
         """Save transcript to file in specified format"""
         try:
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
             if format_type == "json":
-                with open(output_path, 'w', encoding='utf-8') as f:
+                with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
                     json.dump(transcript, f, indent=2, ensure_ascii=False)
             elif format_type == "md":
-                self._save_as_markdown(transcript, output_path)
+                self._save_as_markdown(transcript, output_path, now_str)
             else:  # txt
-                self._save_as_text(transcript, output_path)
+                self._save_as_text(transcript, output_path, now_str)
 
             print(f"Transcript saved to: {output_path}")
         except Exception as e:
             print(f"Error saving transcript: {e}")
 
-    def _save_as_text(self, transcript: Dict[str, Any], output_path: str):
+    def _save_as_text(self, transcript: Dict[str, Any], output_path: str, now_str: Optional[str] = None):
         """Save transcript as plain text"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"Meeting Transcript\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        if now_str is None:
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        parts = ["Meeting Transcript\n", f"Date: {now_str}\n\n"]
 
-            for segment in transcript.get('segments', []):
-                speaker = segment.get('speaker', 'Unknown')
-                text = segment.get('text', '').strip()
-                if text:
-                    f.write(f"[{speaker}]: {text}\n")
+        for segment in transcript.get('segments', []):
+            speaker = segment.get('speaker', 'Unknown')
+            text = segment.get('text', '').strip()
+            if text:
+                parts.append(f"[{speaker}]: {text}\n")
 
-    def _save_as_markdown(self, transcript: Dict[str, Any], output_path: str):
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(parts)
+
+    def _save_as_markdown(self, transcript: Dict[str, Any], output_path: str, now_str: Optional[str] = None):
         """Save transcript as markdown"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Meeting Transcript\n\n")
-            f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        if now_str is None:
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        parts = ["# Meeting Transcript\n\n", f"**Date:** {now_str}\n\n"]
+
+        current_speaker = None
+        for segment in transcript.get('segments', []):
+            speaker = segment.get('speaker', 'Unknown')
+            text = segment.get('text', '').strip()
 
-            current_speaker = None
-            for segment in transcript.get('segments', []):
-                speaker = segment.get('speaker', 'Unknown')
-                text = segment.get('text', '').strip()
+            if text:
+                if speaker != current_speaker:
+                    parts.append(f"\n## {speaker}\n\n")
+                    current_speaker = speaker
+                parts.append(f"{text}\n")
 
-                if text:
-                    if speaker != current_speaker:
-                        f.write(f"\n## {speaker}\n\n")
-                        current_speaker = speaker
-                    f.write(f"{text}\n")
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(parts)
 
     def get_recording_status(self) -> Dict[str, Any]:
         """Get current recording status"""
         return {
             'is_recording': self.is_recording,
             'current_file': str(self.current_recording_path) if self.current_recording_path else None,
-            'recordings': self.recordings.copy()
+            'recordings': self.recordings.copy(),
+            'xruns': self.recording_service.xruns
         }
@@ -0,0 +1,282 @@
+"""
+Result caching for Tabletop Notetaker
+"""
+
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# Root directory for persistent caches
+CACHE_DIR = Path(os.getenv("TTNT_CACHE_DIR", Path.home() / ".cache" / "ttnt"))
+
+# Bytes hashed at a time
+HASH_CHUNK_SIZE = 4 << 20
+
+# Opt in to reusing transcripts of near-duplicate recordings (needs librosa)
+SIMILAR_AUDIO_CACHE = os.getenv("TTNT_SIMILAR_AUDIO_CACHE", "") == "1"
+
+# Audio fingerprint settings: leading seconds analysed, mel bands, and the cosine
+# similarity and relative duration difference allowed for a match
+FINGERPRINT_SECONDS = 60
+FINGERPRINT_MELS = 128
+SIMILARITY_THRESHOLD = 0.9
+DURATION_TOLERANCE = 0.01
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=16)
+
+
+def _safe_tag(tag: str) -> str:
+    """
+    Make an engine/model tag safe to use in a file name (model names may be paths).
+    '-' is replaced too, as it separates the tag from the digest in a key.
+    """
+    return re.sub(r'[^\w.]+', '_', tag)
+
+
+def _key_tag(key: str) -> str:
+    """The engine/model tag of a transcript cache key"""
+    return key.rpartition('-')[0]
+
+
+def file_digest(path: str) -> str:
+    """BLAKE2b hex digest of a file's contents"""
+    h = _new_hash()
+    with open(path, 'rb') as f:
+        try:
+            # Hash straight out of the page cache; slicing a memoryview copies nothing
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                for offset in range(0, len(view), HASH_CHUNK_SIZE):
+                    h.update(view[offset:offset + HASH_CHUNK_SIZE])
+        except (ValueError, OSError):
+            # Empty files cannot be mapped, nor can some special files
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+class JSONCache:
+    """
+    Small key-value store for JSON-serializable values. Entries are kept in memory
+    for the session and as JSON files on disk, with the least recently used files
+    evicted beyond max_entries.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 256):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None"""
+        with self._lock:
+            value = self._memory.get(key)
+        if value is not None:
+            return value
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._memory[key] = value
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value under key"""
+        with self._lock:
+            self._memory[key] = value
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._entry_path(key).with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))  # Readers never see a partial file
+            self._evict()
+        except OSError as e:
+            print(f"Could not write cache entry: {e}")
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _evict(self):
+        """Remove the least recently used entries beyond max_entries"""
+        entries = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class AudioFingerprintIndex:
+    """
+    Log-mel fingerprints of cached recordings, for finding near-duplicates such as
+    a re-encoded copy of the same file. Each fingerprint is the mean log-mel
+    spectrum of the first FINGERPRINT_SECONDS, centred and normalised so that a dot
+    product is the cosine similarity. Vectors are kept in a numpy matrix saved next
+    to a JSON sidecar of keys and durations, in a directory of their own so cache
+    eviction never counts or removes them.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 256):
+        import numpy as np
+
+        self._np = np
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors = np.empty((0, FINGERPRINT_MELS), dtype=np.float32)
+        self._entries = []  # [key, duration] per row of _vectors
+        self._load()
+
+    def fingerprint(self, audio_path: str) -> Optional[Tuple[Any, float]]:
+        """Return (vector, duration) for an audio file, or None if it cannot be read"""
+        import librosa
+
+        np = self._np
+        try:
+            duration = librosa.get_duration(path=audio_path)
+            y, sr = librosa.load(audio_path, sr=16000, mono=True, duration=FINGERPRINT_SECONDS)
+        except Exception as e:
+            print(f"Could not fingerprint audio: {e}")
+            return None
+
+        mel = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=FINGERPRINT_MELS)
+        vec = librosa.power_to_db(mel).mean(axis=1).astype(np.float32)
+        vec -= vec.mean()  # Compare spectral shape rather than overall loudness
+        norm = np.linalg.norm(vec)
+        if not norm:
+            return None
+        return vec / norm, duration
+
+    def query(self, vec: Any, duration: float, tag: str = "") -> Optional[str]:
+        """Key of the most similar fingerprint of about the same duration, or None"""
+        np = self._np
+        with self._lock:
+            if not self._entries:
+                return None
+            sims = self._vectors @ vec
+            durations = np.array([entry[1] for entry in self._entries])
+            keys = [entry[0] for entry in self._entries]
+
+        close = np.abs(durations - duration) <= DURATION_TOLERANCE * max(duration, 1.0)
+        eligible = close & (sims >= SIMILARITY_THRESHOLD) & np.array([_key_tag(k) == tag for k in keys])
+        if not eligible.any():
+            return None
+        return keys[int(np.argmax(np.where(eligible, sims, -1.0)))]
+
+    def add(self, key: str, vec: Any, duration: float):
+        """Record the fingerprint of a newly cached recording"""
+        np = self._np
+        with self._lock:
+            self._vectors = np.vstack([self._vectors, vec[np.newaxis, :]])[-self.max_entries:]
+            self._entries = (self._entries + [[key, duration]])[-self.max_entries:]
+            self._save()
+
+    def _load(self):
+        try:
+            vectors = self._np.load(self.cache_dir / "index.npy")
+            with open(self.cache_dir / "index.json", 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        if len(entries) == len(vectors):
+            self._vectors, self._entries = vectors.astype(self._np.float32), entries
+
+    def _save(self):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._np.save(self.cache_dir / "index.npy", self._vectors)
+            with open(self.cache_dir / "index.json", 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+        except OSError as e:
+            print(f"Could not write fingerprint index: {e}")
+
+
+class TranscriptCache(JSONCache):
+    """
+    Transcripts keyed by the content hash of their audio file, so re-selecting
+    the same recording skips transcription. With similar_audio set (and librosa
+    installed) a second tier matches near-duplicate recordings by fingerprint.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 256,
+                 similar_audio: bool = False):
+        super().__init__(cache_dir or CACHE_DIR / "transcripts", max_entries)
+        self.index = None
+        self._fingerprints = {}  # Fingerprints of looked-up files awaiting set()
+        if similar_audio and importlib.util.find_spec("librosa"):
+            self.index = AudioFingerprintIndex(self.cache_dir / "fingerprints", max_entries)
+
+    def key_for(self, audio_path: str, engine: str = "") -> str:
+        """
+        Cache key for an audio file as transcribed by the given engine; include the
+        model name (see TranscriptionService.model_id) so switching models misses
+        """
+        digest = file_digest(audio_path)
+        tag = _safe_tag(engine)
+        return f"{tag}-{digest}" if tag else digest
+
+    def lookup(self, audio_path: str, engine: str = "") -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Return (key, transcript) for an audio file. The exact content hash is tried
+        first; on a miss the fingerprint index is searched for a near-duplicate.
+        transcript is None on a miss, and key is where to set() the new transcript.
+        """
+        key = self.key_for(audio_path, engine)
+        transcript = self.get(key)
+        if transcript is not None or self.index is None:
+            return key, transcript
+
+        fingerprint = self.index.fingerprint(audio_path)
+        if fingerprint is None:
+            return key, None
+
+        with self._lock:
+            self._fingerprints[key] = fingerprint
+        match = self.index.query(*fingerprint, tag=_safe_tag(engine))
+        transcript = self.get(match) if match else None
+        if transcript is not None:
+            self.set(key, transcript)  # Later lookups of this file hit on the hash
+        return key, transcript
+
+    def set(self, key: str, value: Any):
+        """Store a transcript, indexing its fingerprint if lookup() computed one"""
+        super().set(key, value)
+        with self._lock:
+            fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is not None:
+            self.index.add(key, *fingerprint)
+
+
+class SummaryCache(JSONCache):
+    """
+    Extracted summary data keyed by a hash of the transcript's speakers and text.
+    The formatted notes are not cached, so the date and duration they show stay
+    current; only the extraction work is skipped.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 256):
+        super().__init__(cache_dir or CACHE_DIR / "summaries", max_entries)
+
+    def key_for(self, segments: List[Dict[str, Any]]) -> str:
+        """Cache key for a list of transcript segments"""
+        h = hashlib.sha256()
+        for segment in segments:
+            h.update(f"{segment.get('speaker', 'Unknown')}\0{segment.get('text', '')}\n".encode('utf-8'))
+        return h.hexdigest()
@@ -3,12 +3,26 @@ Audio recording service for Tabletop Notetaker
 """
 
 import pyaudio
-import wave
+import queue
+import struct
 import threading
 import time
 from pathlib import Path
 from typing import Optional, Callable
 
+from services.vad import SpeechSegmenter
+
+
+# Bytes per sample for paInt16
+SAMPLE_WIDTH = 2
+
+# Seconds of audio held in memory before it is spilled to the output file
+SPILL_SECONDS = 10
+
+# Chunks allowed in flight between the PortAudio callback and the writer thread;
+# at the default 1024-frame chunks (~23 ms at 44.1 kHz) this is about 0.75 s of slack
+CAPTURE_QUEUE_CHUNKS = 32
+
 
 class RecordingService:
     """Handles audio recording with optional persistence"""
@@ -19,52 +33,149 @@ class RecordingService:
         self.chunk_size = chunk_size
         self.audio = None
         self.stream = None
-        self.frames = []
+        self._buf = bytearray()
+        self._pos = 0
+        self._bytes_recorded = 0
+        self._out = None
         self.is_recording = False
-        self.recording_thread = None
+        self.chunk_callback = None
         self.output_path = None
-
-    def start_recording(self, output_path: Optional[str] = None, callback: Optional[Callable] = None):
-        """Start audio recording"""
+        # Closed speech segments as (start, end, pcm) tuples, ended by None; see start_recording
+        self.chunk_queue = queue.Queue()
+        self._segmenter = None
+        self._capture_q = None
+        self._writer = None
+        self._writer_error = None
+        self.xruns = 0  # Chunks dropped because the writer fell behind
+
+    def start_recording(self, output_path: Optional[str] = None, callback: Optional[Callable] = None,
+                        segment_speech: bool = False):
+        """
+        Start audio recording
+        With segment_speech, each speech segment is put on chunk_queue as soon as
+        it closes, so it can be transcribed while recording continues
+        """
         if self.is_recording:
             print("Already recording!")
             return
 
         self.output_path = output_path
-        self.frames = []
+        self._buf = bytearray(SPILL_SECONDS * self.sample_rate * self.channels * SAMPLE_WIDTH)
+        self._pos = 0
+        self._bytes_recorded = 0
+        self._out = self._open_output(output_path) if output_path else None
+        self.chunk_callback = callback
+        self.chunk_queue = queue.Queue()
+        self._segmenter = SpeechSegmenter(self.sample_rate, SAMPLE_WIDTH, self.channels) if segment_speech else None
+        self._capture_q = queue.Queue(maxsize=CAPTURE_QUEUE_CHUNKS)
+        self._writer_error = None
+        self.xruns = 0
         self.is_recording = True
 
-        # Initialize PyAudio
-        self.audio = pyaudio.PyAudio()
+        # Buffering, disk writes and segmentation run here, off the audio thread
+        self._writer = threading.Thread(target=self._write_loop, name="recording-writer", daemon=True)
+        self._writer.start()
+
+        try:
+            # Initialize PyAudio
+            self.audio = pyaudio.PyAudio()
+
+            # Open audio stream
+            self.stream = self.audio.open(
+                format=pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.sample_rate,
+                input=True,
+                frames_per_buffer=self.chunk_size,
+                stream_callback=self._pa_cb
+            )
+        except Exception:
+            # Don't leave a stuck recording state or an empty WAV behind
+            self.is_recording = False
+            self._stop_writer()
+            if self._out:
+                self._out.close()
+                Path(output_path).unlink()
+                self._out = None
+            raise
 
-        # Open audio stream
-        self.stream = self.audio.open(
-            format=pyaudio.paInt16,
-            channels=self.channels,
-            rate=self.sample_rate,
-            input=True,
-            frames_per_buffer=self.chunk_size
-        )
+        print("Recording started...")
 
-        # Start recording in a separate thread
-        self.recording_thread = threading.Thread(target=self._record_loop, args=(callback,))
-        self.recording_thread.daemon = True
-        self.recording_thread.start()
+    def _open_output(self, output_path: str):
+        """Open the WAV file that audio is spilled into, leaving room for the header"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-        print("Recording started...")
+        out = open(output_path, 'wb')
+        out.write(self._wav_header(0))  # Sizes are patched in when recording stops
+        return out
 
-    def _record_loop(self, callback: Optional[Callable]):
-        """Main recording loop"""
-        while self.is_recording:
+    def _pa_cb(self, in_data, frame_count, time_info, status):
+        """PortAudio stream callback, invoked on the audio thread for every chunk"""
+        if not self.is_recording:
+            return (None, pyaudio.paComplete)
+        if self._writer_error:
+            return (None, pyaudio.paAbort)
+
+        # Never block the audio thread: when the writer falls behind, drop the
+        # oldest chunk so the queue stays bounded and the newest audio is kept
+        try:
+            self._capture_q.put_nowait(in_data)
+        except queue.Full:
             try:
-                data = self.stream.read(self.chunk_size)
-                self.frames.append(data)
-
-                if callback:
-                    callback(data)
+                self._capture_q.get_nowait()
+            except queue.Empty:
+                pass
+            self.xruns += 1
+            self._capture_q.put_nowait(in_data)  # This callback is the only producer
+
+        return (None, pyaudio.paContinue)
+
+    def _write_loop(self):
+        """Writer thread: consume captured chunks until the None sentinel"""
+        for data in iter(self._capture_q.get, None):
+            if self._writer_error:
+                continue  # Keep draining so stop_recording's sentinel is reached
+            try:
+                self._process_chunk(data)
             except Exception as e:
                 print(f"Recording error: {e}")
-                break
+                self._writer_error = e
+
+    def _process_chunk(self, data: bytes):
+        """Buffer a captured chunk and hand it to the segmenter and callback"""
+        self._append(data)
+
+        if self._segmenter:
+            for chunk in self._segmenter.feed(data):
+                self.chunk_queue.put(chunk)
+
+        if self.chunk_callback:
+            self.chunk_callback(data)
+
+    def _stop_writer(self):
+        """Let the writer thread finish the queued chunks and exit"""
+        if self._writer:
+            self._capture_q.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _append(self, data: bytes):
+        """Copy a chunk into the capture buffer, spilling the buffer to disk when full"""
+        if self._pos + len(data) > len(self._buf):
+            self._spill()
+
+        end = self._pos + len(data)
+        if end > len(self._buf):
+            self._buf.extend(bytes(end - len(self._buf)))
+        self._buf[self._pos:end] = data
+        self._pos = end
+        self._bytes_recorded += len(data)
+
+    def _spill(self):
+        """Write the buffered audio to the output file and reuse the buffer"""
+        if self._out and self._pos:
+            self._out.write(memoryview(self._buf)[:self._pos])
+        self._pos = 0
 
     def stop_recording(self) -> Optional[str]:
         """Stop recording and save to file if path provided"""
@@ -73,11 +184,7 @@ class RecordingService:
 
         self.is_recording = False
 
-        # Wait for recording thread to finish
-        if self.recording_thread and self.recording_thread.is_alive():
-            self.recording_thread.join(timeout=2.0)
-
-        # Close stream
+        # Close stream (stop_stream waits for any in-flight callback)
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
@@ -86,32 +193,58 @@ class RecordingService:
         if self.audio:
             self.audio.terminate()
 
+        # No more chunks can arrive; wait for the writer to catch up
+        self._stop_writer()
+
+        # Hand over the trailing speech segment and mark the end of the stream
+        if self._segmenter:
+            for chunk in self._segmenter.flush():
+                self.chunk_queue.put(chunk)
+            self.chunk_queue.put(None)
+            self._segmenter = None
+
         # Save recording if path provided
-        if self.output_path and self.frames:
+        if self._out:
             try:
-                self._save_recording(self.output_path)
-                print(f"Recording saved to: {self.output_path}")
-                return self.output_path
+                self._save_recording()
+                if self._bytes_recorded:
+                    print(f"Recording saved to: {self.output_path}")
+                    return self.output_path
+                Path(self.output_path).unlink()  # Nothing was captured
             except Exception as e:
                 print(f"Error saving recording: {e}")
+            finally:
+                self._out = None
 
         return None
 
-    def _save_recording(self, output_path: str):
-        """Save recorded frames to WAV file"""
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        with wave.open(output_path, 'wb') as wf:
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(b''.join(self.frames))
+    def _save_recording(self):
+        """Flush the remaining audio and finalize the WAV header"""
+        try:
+            self._spill()
+
+            # The canonical 44-byte PCM header is written directly rather than going
+            # through wave's incremental header patching
+            self._out.seek(0)
+            self._out.write(self._wav_header(self._bytes_recorded))
+        finally:
+            self._out.close()
+
+    def _wav_header(self, data_size: int) -> bytes:
+        """Build a RIFF/WAVE header for data_size bytes of PCM audio"""
+        block_align = self.channels * SAMPLE_WIDTH
+        return struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, self.channels, self.sample_rate,
+            self.sample_rate * block_align, block_align, SAMPLE_WIDTH * 8,
+            b'data', data_size
+        )
 
     def get_recording_duration(self) -> float:
         """Get current recording duration in seconds"""
-        if not self.frames:
-            return 0.0
-        return len(self.frames) * self.chunk_size / self.sample_rate
+        frames = self._bytes_recorded // (self.channels * SAMPLE_WIDTH)
+        return frames / self.sample_rate
 
     def is_currently_recording(self) -> bool:
         """Check if currently recording"""
@@ -2,22 +2,146 @@
 Summarization service for creating notes from transcripts
 """
 
+import io
 import json
 import re
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from typing import Dict, List, Any, Optional, TextIO, Callable
 from datetime import datetime
 
+from services.cache import SummaryCache
+
+
+_SENT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_ACTION_RE = re.compile(r'\b(?:todo|need to|should|will|action)\b', re.IGNORECASE)
+
+# Byte translation table that lowercases ASCII letters, keeps the other \w characters
+# (digits and underscore) and turns everything else into a space
+_ASCII_WORD_TABLE = bytes(
+    b + 32 if 65 <= b <= 90 else (b if 97 <= b <= 122 or 48 <= b <= 57 or b == 95 else 32)
+    for b in range(256)
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase words, the same as _WORD_RE.findall(text.lower())"""
+    if text.isascii():
+        # One C-level pass without the regex engine for the common ASCII case
+        return text.encode('ascii').translate(_ASCII_WORD_TABLE).decode('ascii').split()
+    return _WORD_RE.findall(text.lower())
+
+
+class IncrementalSummary:
+    """
+    Accumulates summary data one transcript segment at a time, so summarizing
+    can start while transcription is still producing segments
+    """
+
+    def __init__(self, common_words: frozenset):
+        self.common_words = common_words
+        self.speakers = {}  # Insertion-ordered set
+        self.key_points = []
+        self.action_items = []
+        self.word_freq = Counter()
+        self.summary_sentences = []
+        self.total_segments = 0
+        self._carry = None
+
+    def add(self, segment: Dict[str, Any]):
+        """Fold a single transcript segment into the summary"""
+        self.total_segments += 1
+        text = segment.get('text', '').strip()
+        speaker = segment.get('speaker', 'Unknown')
+
+        if not text:
+            return
+
+        self.speakers[speaker] = None
+
+        # Extract potential action items
+        if len(self.action_items) < 5 and _ACTION_RE.search(text):
+            self.action_items.append(f"{speaker}: {text}")
+
+        # Extract key points (sentences with important indicators)
+        sentences = _SENT_RE.split(text)
+        key_points = self.key_points
+        for sentence in sentences:
+            if len(key_points) >= 10:
+                break
+            sentence = sentence.strip()
+            if len(sentence) > 20:  # Only consider substantial sentences
+                key_points.append(sentence)
+
+        self._count_keywords(text)
+
+        if len(self.summary_sentences) < 3:
+            self._collect_summary_sentences(sentences)
+
+    def finalize(self) -> Dict[str, Any]:
+        """Return the extracted summary data for the segments added so far"""
+        summary_sentences = list(self.summary_sentences)
+
+        # A trailing sentence without closing punctuation still counts
+        if self._carry is not None and len(summary_sentences) < 3:
+            carry = self._carry.strip()
+            if len(carry) > 20:
+                summary_sentences.append(carry)
+
+        return {
+            'speakers': list(self.speakers),
+            'total_segments': self.total_segments,
+            'key_points': list(self.key_points),  # Limited to top 10
+            'action_items': list(self.action_items),  # Limited to 5
+            'keywords': self._extract_keywords(),  # Limited to 15
+            'summary_text': ' '.join(summary_sentences)
+        }
+
+    def _count_keywords(self, text: str):
+        """Add the candidate keywords in text to the running frequency count"""
+        # Bind to a local so the generator avoids an attribute lookup per word;
+        # the cheap length check runs first and rejects most common words outright
+        common_words = self.common_words
+        self.word_freq.update(
+            word for word in _tokenize(text)
+            if len(word) > 3 and word not in common_words
+        )
+
+    def _extract_keywords(self) -> List[str]:
+        """Return the most frequent keywords that occur more than once"""
+        return [word for word, freq in self.word_freq.most_common(15) if freq > 1]
+
+    def _collect_summary_sentences(self, sentences: List[str]):
+        """
+        Collect the first 3 substantial sentences for the summary text.
+        Segments are treated as if joined by spaces, so the unterminated tail of
+        one segment continues into the first sentence of the next.
+        """
+        if self._carry is not None:
+            sentences = [f"{self._carry} {sentences[0]}"] + sentences[1:]
+
+        for sentence in sentences[:-1]:
+            sentence = sentence.strip()
+            if len(sentence) > 20:
+                self.summary_sentences.append(sentence)
+                if len(self.summary_sentences) == 3:
+                    break
+
+        self._carry = sentences[-1]
+
 
 class SummarizationService:
     """Handles transcript summarization and note generation"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional['SummaryCache'] = None):
+        self.cache = cache
+
         # Simple keyword-based summarization (can be enhanced with LLM)
-        self.common_words = {
+        self.common_words = frozenset({
             'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
             'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
             'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'shall'
-        }
+        })
 
     def summarize(self, transcript: Dict[str, Any], format_type: str = "txt") -> str:
         """Summarize transcript into formatted notes"""
@@ -30,160 +154,143 @@ class SummarizationService:
         summary_data = self._extract_summary_data(segments)
 
         # Format based on requested type
-        if format_type == "md":
-            return self._format_markdown_summary(summary_data, transcript)
-        elif format_type == "json":
-            return self._format_json_summary(summary_data, transcript)
-        else:
-            return self._format_text_summary(summary_data, transcript)
-
-    def _extract_summary_data(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract key information from transcript segments"""
-        all_text = []
-        speakers = set()
-        key_points = []
-        action_items = []
-
-        for segment in segments:
-            text = segment.get('text', '').strip()
-            speaker = segment.get('speaker', 'Unknown')
-
-            if text:
-                all_text.append(text)
-                speakers.add(speaker)
-
-                # Extract potential action items
-                if any(word in text.lower() for word in ['todo', 'need to', 'should', 'will', 'action']):
-                    action_items.append(f"{speaker}: {text}")
-
-                # Extract key points (sentences with important indicators)
-                sentences = re.split(r'[.!?]+', text)
-                for sentence in sentences:
-                    sentence = sentence.strip()
-                    if len(sentence) > 20:  # Only consider substantial sentences
-                        key_points.append(sentence)
+        return self.format_summary(summary_data, transcript, format_type)
 
-        # Extract keywords
-        full_text = ' '.join(all_text)
-        keywords = self._extract_keywords(full_text)
+    def write_summary(self, transcript: Dict[str, Any], format_type: str, fh: TextIO):
+        """Summarize transcript and write the formatted notes to an open text file"""
+        segments = transcript.get('segments', [])
 
-        return {
-            'speakers': list(speakers),
-            'total_segments': len(segments),
-            'key_points': key_points[:10],  # Limit to top 10
-            'action_items': action_items[:5],  # Limit to 5
-            'keywords': keywords[:15],  # Limit to 15
-            'summary_text': self._generate_summary_text(all_text)
-        }
+        if not segments:
+            fh.write("No transcript content to summarize.")
+            return
 
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract important keywords from text"""
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_freq = {}
+        summary_data = self._extract_summary_data(segments)
+        now = datetime.now()
 
-        for word in words:
-            if len(word) > 3 and word not in self.common_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        # JSON is streamed to the file rather than built as one string first
+        if format_type == "md":
+            self._write_markdown_summary(summary_data, transcript, fh.write, now)
+        elif format_type == "json":
+            json.dump(self._build_json_summary(summary_data, transcript, now), fh, indent=2, ensure_ascii=False)
+        else:
+            self._write_text_summary(summary_data, transcript, fh.write, now)
 
-        # Sort by frequency
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words if freq > 1]
+    def new_summary(self) -> 'IncrementalSummary':
+        """Start an incremental summary that segments can be fed into one at a time"""
+        return IncrementalSummary(self.common_words)
 
-    def _generate_summary_text(self, text_segments: List[str]) -> str:
-        """Generate a concise summary of the discussion"""
-        full_text = ' '.join(text_segments)
+    def format_summary(self, summary_data: Dict[str, Any], transcript: Dict[str, Any],
+                       format_type: str = "txt") -> str:
+        """Format extracted summary data (see IncrementalSummary.finalize) as notes"""
+        now = datetime.now()
 
-        # Simple extractive summarization
-        sentences = re.split(r'[.!?]+', full_text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        if format_type == "md":
+            return self._format_markdown_summary(summary_data, transcript, now)
+        elif format_type == "json":
+            return self._format_json_summary(summary_data, transcript, now)
+        else:
+            return self._format_text_summary(summary_data, transcript, now)
 
-        # Select sentences that seem important
-        important_sentences = []
-        for sentence in sentences[:5]:  # Take first 5 substantial sentences
-            if len(important_sentences) < 3:  # Limit to 3
-                important_sentences.append(sentence)
+    def _extract_summary_data(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extract key information from transcript segments, reusing cached results"""
+        cache_key = self.cache.key_for(segments) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cached
+
+        summary = self.new_summary()
+        for segment in segments:
+            summary.add(segment)
+        summary_data = summary.finalize()
 
-        return ' '.join(important_sentences)
+        if cache_key:
+            self.cache.set(cache_key, summary_data)
+        return summary_data
 
-    def _format_text_summary(self, data: Dict[str, Any], transcript: Dict[str, Any]) -> str:
+    def _format_text_summary(self, data: Dict[str, Any], transcript: Dict[str, Any],
+                             now: Optional[datetime] = None) -> str:
         """Format summary as plain text"""
-        lines = []
-        lines.append("MEETING SUMMARY")
-        lines.append("=" * 50)
-        lines.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"Duration: {transcript.get('duration', 'Unknown')} seconds")
-        lines.append("")
-
-        lines.append("PARTICIPANTS:")
-        for speaker in data['speakers']:
-            lines.append(f"  - {speaker}")
-        lines.append("")
+        buf = io.StringIO()
+        self._write_text_summary(data, transcript, buf.write, now)
+        return buf.getvalue()
+
+    def _write_text_summary(self, data: Dict[str, Any], transcript: Dict[str, Any], w: Callable[[str], Any],
+                            now: Optional[datetime] = None):
+        """Write plain text summary through the write callable w"""
+        now = now or datetime.now()
+        w("MEETING SUMMARY\n")
+        w("=" * 50 + "\n")
+        w(f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"Duration: {transcript.get('duration', 'Unknown')} seconds\n")
+
+        # Each section opens with the blank line separating it from the previous one
+        w("\nPARTICIPANTS:\n")
+        w("".join(f"  - {speaker}\n" for speaker in data['speakers']))
 
         if data['summary_text']:
-            lines.append("SUMMARY:")
-            lines.append(data['summary_text'])
-            lines.append("")
+            w("\nSUMMARY:\n")
+            w(f"{data['summary_text']}\n")
 
         if data['key_points']:
-            lines.append("KEY POINTS:")
-            for i, point in enumerate(data['key_points'], 1):
-                lines.append(f"  {i}. {point}")
-            lines.append("")
+            w("\nKEY POINTS:\n")
+            w("".join(f"  {i}. {point}\n" for i, point in enumerate(data['key_points'], 1)))
 
         if data['action_items']:
-            lines.append("ACTION ITEMS:")
-            for i, item in enumerate(data['action_items'], 1):
-                lines.append(f"  {i}. {item}")
-            lines.append("")
+            w("\nACTION ITEMS:\n")
+            w("".join(f"  {i}. {item}\n" for i, item in enumerate(data['action_items'], 1)))
 
         if data['keywords']:
-            lines.append("TOPICS/KEYWORDS:")
-            lines.append(", ".join(data['keywords']))
+            w("\nTOPICS/KEYWORDS:\n")
+            w(", ".join(data['keywords']))
 
-        return "\n".join(lines)
-
-    def _format_markdown_summary(self, data: Dict[str, Any], transcript: Dict[str, Any]) -> str:
+    def _format_markdown_summary(self, data: Dict[str, Any], transcript: Dict[str, Any],
+                                 now: Optional[datetime] = None) -> str:
         """Format summary as Markdown"""
-        lines = []
-        lines.append("# Meeting Summary")
-        lines.append("")
-        lines.append(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"**Duration:** {transcript.get('duration', 'Unknown')} seconds")
-        lines.append("")
-
-        lines.append("## Participants")
-        for speaker in data['speakers']:
-            lines.append(f"- {speaker}")
-        lines.append("")
+        buf = io.StringIO()
+        self._write_markdown_summary(data, transcript, buf.write, now)
+        return buf.getvalue()
+
+    def _write_markdown_summary(self, data: Dict[str, Any], transcript: Dict[str, Any], w: Callable[[str], Any],
+                                now: Optional[datetime] = None):
+        """Write Markdown summary through the write callable w"""
+        now = now or datetime.now()
+        w("# Meeting Summary\n\n")
+        w(f"**Date:** {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"**Duration:** {transcript.get('duration', 'Unknown')} seconds\n")
+
+        # Each section opens with the blank line separating it from the previous one
+        w("\n## Participants\n")
+        w("".join(f"- {speaker}\n" for speaker in data['speakers']))
 
         if data['summary_text']:
-            lines.append("## Summary")
-            lines.append(data['summary_text'])
-            lines.append("")
+            w("\n## Summary\n")
+            w(f"{data['summary_text']}\n")
 
         if data['key_points']:
-            lines.append("## Key Points")
-            for point in data['key_points']:
-                lines.append(f"- {point}")
-            lines.append("")
+            w("\n## Key Points\n")
+            w("".join(f"- {point}\n" for point in data['key_points']))
 
         if data['action_items']:
-            lines.append("## Action Items")
-            for item in data['action_items']:
-                lines.append(f"- {item}")
-            lines.append("")
+            w("\n## Action Items\n")
+            w("".join(f"- {item}\n" for item in data['action_items']))
 
         if data['keywords']:
-            lines.append("## Topics/Keywords")
-            lines.append(", ".join(data['keywords']))
-
-        return "\n".join(lines)
+            w("\n## Topics/Keywords\n")
+            w(", ".join(data['keywords']))
 
-    def _format_json_summary(self, data: Dict[str, Any], transcript: Dict[str, Any]) -> str:
+    def _format_json_summary(self, data: Dict[str, Any], transcript: Dict[str, Any],
+                             now: Optional[datetime] = None) -> str:
         """Format summary as JSON"""
-        summary = {
+        return json.dumps(self._build_json_summary(data, transcript, now), indent=2, ensure_ascii=False)
+
+    def _build_json_summary(self, data: Dict[str, Any], transcript: Dict[str, Any],
+                            now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Build the JSON-serializable summary structure"""
+        now = now or datetime.now()
+        return {
             'metadata': {
-                'date': datetime.now().isoformat(),
+                'date': now.isoformat(),
                 'duration': transcript.get('duration', 0),
                 'file_path': transcript.get('file_path', '')
             },
@@ -193,4 +300,3 @@ class SummarizationService:
             'action_items': data['action_items'],
             'keywords': data['keywords']
         }
-        return json.dumps(summary, indent=2, ensure_ascii=False)
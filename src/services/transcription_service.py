@@ -2,50 +2,104 @@
 Transcription service with speaker diarization for Tabletop Notetaker
 """
 
+import importlib.util
+import io
 import json
+import math
+import os
+import threading
 import time
+import wave
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
 import speech_recognition as sr
 from datetime import datetime, timedelta
 
+from services.vad import SpeechSegmenter, MIN_SEGMENT_SECONDS, MAX_SEGMENT_SECONDS, adapted_threshold
+
+
+# Bytes of PCM handed to the speech segmenter at a time
+VAD_BLOCK_BYTES = 1 << 16
+
+# Concurrent recognition requests; they are network-bound, not CPU-bound
+MAX_WORKERS = 8
+
+# Placeholder text for a recording in which nothing could be recognized
+INAUDIBLE_TEXT = '[Inaudible]'
+
+# Whisper model size used by the local engine (tiny, base, small, medium, large-v3, ...)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "small")
+
 
 class TranscriptionService:
     """Handles audio transcription with speaker diarization"""
 
-    def __init__(self):
+    def __init__(self, engine: Optional[str] = None):
         self.recognizer = sr.Recognizer()
         # Adjust for ambient noise
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
 
-    def transcribe_with_diarization(self, audio_path: str) -> Dict[str, Any]:
+        # Local faster-whisper decoding when it is installed, Google Speech Recognition otherwise
+        if engine is None:
+            engine = os.getenv("TRANSCRIPTION_ENGINE")
+        if engine is None:
+            engine = "whisper" if importlib.util.find_spec("faster_whisper") else "google"
+        self.engine = engine
+        self.model = None  # Loaded on first use
+        self._model_lock = threading.Lock()
+        self._cancelled = threading.Event()  # Set by cancel() when the app shuts down
+
+    def cancel(self):
+        """
+        Stop transcription for good: a transcription in progress raises instead of
+        sending more audio, so shutting down only waits for requests already in flight
+        """
+        self._cancelled.set()
+
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise RuntimeError("Transcription cancelled")
+
+    @property
+    def model_id(self) -> str:
+        """Engine and model name, so results from different models are kept apart"""
+        return f"whisper-{WHISPER_MODEL}" if self.engine == "whisper" else self.engine
+
+    def transcribe_with_diarization(self, audio_path: str,
+                                    on_segment: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Transcribe audio file with basic speaker diarization
         Note: For production use, consider using more advanced diarization libraries
         like pyannote.audio or similar
+
+        on_segment, if given, is called with each segment as soon as it is transcribed
         """
         try:
             print(f"Loading audio file: {audio_path}")
 
-            # Load audio file
-            with sr.AudioFile(audio_path) as source:
-                # Record the entire audio file
-                audio = self.recognizer.record(source)
-
-                # Get duration for segmentation
-                duration = source.DURATION if hasattr(source, 'DURATION') else 30
-
-            # Perform transcription with basic segmentation
-            transcript = self._transcribe_segmented(audio, duration)
-
-            return {
+            transcript = {
                 'file_path': audio_path,
-                'duration': duration,
+                'duration': self._get_duration(audio_path),
                 'timestamp': datetime.now().isoformat(),
-                'segments': transcript
+                'segments': []
             }
 
+            # Perform transcription with basic segmentation
+            for segment in self.iter_segments(audio_path):
+                transcript['segments'].append(segment)
+                if on_segment:
+                    on_segment(segment)
+
+            # Formats speech_recognition can't read (whisper engine only)
+            if transcript['duration'] is None:
+                segments = transcript['segments']
+                transcript['duration'] = segments[-1]['end'] if segments else 0.0
+
+            return transcript
+
         except Exception as e:
             print(f"Transcription error: {e}")
             return {
@@ -54,61 +108,224 @@ class TranscriptionService:
                 'segments': []
             }
 
-    def _transcribe_segmented(self, audio: sr.AudioData, duration: float) -> List[Dict[str, Any]]:
+    def iter_segments(self, audio_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield transcript segments for an audio file in order as they become available"""
+        if self.engine == "whisper":
+            yield from self._iter_whisper_segments(audio_path)
+            return
+
+        # Load audio file
+        with sr.AudioFile(audio_path) as source:
+            # Get duration for segmentation
+            duration = source.DURATION if hasattr(source, 'DURATION') else 30
+            audio = self.recognizer.record(source)
+
+        # Only send the regions that contain speech; very short files go as-is
+        if duration < MIN_SEGMENT_SECONDS:
+            chunks = [(0.0, duration, audio)]
+        else:
+            chunks = self._speech_chunks(audio)
+
+        yield from self._transcribe_segmented(chunks, duration)
+
+    def _speech_chunks(self, audio: sr.AudioData) -> List[Tuple[float, float, sr.AudioData]]:
         """
-        Transcribe audio in segments with simulated speaker diarization
+        Split audio into speech regions, dropping silence. With dynamic_energy_threshold
+        set, the threshold is lowered to suit the recording's own noise floor, so quiet
+        recordings are not mistaken for silence. If no speech is found at all the audio
+        is sent in fixed windows instead, rather than skipped.
+        """
+        threshold = self.recognizer.energy_threshold
+        if self.recognizer.dynamic_energy_threshold:
+            threshold = adapted_threshold(audio.frame_data, audio.sample_rate, audio.sample_width, threshold)
+
+        segmenter = SpeechSegmenter(audio.sample_rate, audio.sample_width, energy_threshold=threshold)
+        data = memoryview(audio.frame_data)
+        regions = []
+        for pos in range(0, len(data), VAD_BLOCK_BYTES):
+            regions.extend(segmenter.feed(data[pos:pos + VAD_BLOCK_BYTES]))
+        regions.extend(segmenter.flush())
+
+        if not regions:
+            bytes_per_second = audio.sample_rate * audio.sample_width
+            window = int(MAX_SEGMENT_SECONDS * bytes_per_second)
+            regions = [
+                (pos / bytes_per_second, min(pos + window, len(data)) / bytes_per_second,
+                 bytes(data[pos:pos + window]))
+                for pos in range(0, len(data), window)
+            ]
+
+        return [(start, end, sr.AudioData(raw, audio.sample_rate, audio.sample_width))
+                for start, end, raw in regions]
+
+    def _iter_whisper_segments(self, audio_path) -> Iterator[Dict[str, Any]]:
+        """Yield segments decoded locally by faster-whisper"""
+        # The returned segments are a lazy generator; decoding happens as they are consumed
+        segments, info = self._get_model().transcribe(audio_path, vad_filter=True, word_timestamps=True)
+
+        for segment in segments:
+            self._check_cancelled()
+            text = segment.text.strip()
+            if not text:
+                continue
+
+            yield {
+                'start': segment.start,
+                'end': segment.end,
+                'speaker': 'Speaker 1',  # Default speaker
+                'text': text,
+                'confidence': math.exp(segment.avg_logprob),
+                'words': [
+                    {'start': word.start, 'end': word.end, 'word': word.word, 'probability': word.probability}
+                    for word in segment.words or []
+                ]
+            }
+
+    def _get_model(self):
+        """Load the faster-whisper model, quantized to int8, on first use"""
+        with self._model_lock:
+            if self.model is None:
+                import ctranslate2
+                from faster_whisper import WhisperModel
+
+                if ctranslate2.get_cuda_device_count() > 0:
+                    device, compute_type = "cuda", "int8_float16"
+                else:
+                    device, compute_type = "cpu", "int8"
+
+                print(f"Loading Whisper model '{WHISPER_MODEL}' ({device}, {compute_type})")
+                self.model = WhisperModel(WHISPER_MODEL, device=device, compute_type=compute_type)
+            return self.model
+
+    def _get_duration(self, audio_path: str) -> Optional[float]:
+        """Read the duration of an audio file from its header"""
+        try:
+            with sr.AudioFile(audio_path) as source:
+                return source.DURATION if hasattr(source, 'DURATION') else 30
+        except ValueError:
+            if self.engine != "whisper":
+                raise
+            return None  # Not WAV/AIFF/FLAC; faster-whisper decodes it through PyAV
+
+    def _transcribe_segmented(self, chunks: List[Tuple[float, float, sr.AudioData]],
+                              duration: float) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe speech chunks in parallel with simulated speaker diarization
         In a real implementation, you'd use proper diarization models
+
+        Recognition is network-bound, so chunks are sent concurrently; segments
+        are still yielded in chunk order. Only MAX_WORKERS chunks are submitted
+        ahead of the one being waited on, so cancel() leaves at most that many
+        requests to finish.
         """
-        segments = []
-        segment_length = 10  # seconds per segment
+        transcribed = False
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            try:
+                chunks = iter(chunks)
+                while True:
+                    self._check_cancelled()
+                    for chunk in chunks:
+                        in_flight.append(executor.submit(self._transcribe_chunk_audio, *chunk))
+                        if len(in_flight) >= MAX_WORKERS:
+                            break
+                    if not in_flight:
+                        break
+                    segment = in_flight.popleft().result()
+                    if segment:
+                        transcribed = True
+                        yield segment
+            finally:
+                # Stopped early (cancelled, failed, or the consumer went away);
+                # don't send chunks nobody will read
+                for future in in_flight:
+                    future.cancel()
+
+        if not transcribed:
+            print("Could not understand audio")
+            yield {
+                'start': 0.0,
+                'end': duration,
+                'speaker': 'Unknown',
+                'text': INAUDIBLE_TEXT,
+                'confidence': 0.0
+            }
 
+    def _transcribe_chunk_audio(self, start: float, end: float, audio: sr.AudioData) -> Optional[Dict[str, Any]]:
+        """Transcribe one chunk of audio, returning None if it contains no recognizable speech"""
         try:
             # For basic transcription without advanced diarization
             text = self.recognizer.recognize_google(audio)
 
-            # Create a single segment for the entire audio
             # In production, you'd split this into speaker segments
-            segments.append({
-                'start': 0.0,
-                'end': duration,
+            return {
+                'start': start,
+                'end': end,
                 'speaker': 'Speaker 1',  # Default speaker
                 'text': text,
                 'confidence': 0.8  # Estimated confidence
-            })
+            }
 
         except sr.UnknownValueError:
-            print("Could not understand audio")
-            segments.append({
-                'start': 0.0,
-                'end': duration,
-                'speaker': 'Unknown',
-                'text': '[Inaudible]',
-                'confidence': 0.0
-            })
+            return None
         except sr.RequestError as e:
             print(f"Could not request results from speech recognition service: {e}")
-            segments.append({
-                'start': 0.0,
-                'end': duration,
+            return {
+                'start': start,
+                'end': end,
                 'speaker': 'Error',
                 'text': f'[Transcription service error: {e}]',
                 'confidence': 0.0
-            })
-
-        return segments
+            }
 
-    def transcribe_realtime(self, audio_data: bytes) -> Optional[str]:
-        """Transcribe audio data in real-time (for live transcription)"""
+    def transcribe_chunk(self, audio_data: bytes, sample_rate: int = 44100, sample_width: int = 2) -> Optional[str]:
+        """
+        Transcribe a chunk of raw mono PCM audio (for live transcription)
+        Returns None when no speech is recognized; errors reaching the recognition
+        service are raised so callers can tell a gap from silence
+        """
         try:
+            if self.engine == "whisper":
+                buf = self._wav_buffer(audio_data, sample_rate, sample_width)
+                segments, info = self._get_model().transcribe(buf, vad_filter=True)
+                text = " ".join(segment.text.strip() for segment in segments).strip()
+                return text or None
+
             # Convert bytes to AudioData
-            audio = sr.AudioData(audio_data, 44100, 2)  # Assuming 44.1kHz, 16-bit
+            audio = sr.AudioData(audio_data, sample_rate, sample_width)
 
             # Quick transcription for real-time use
             text = self.recognizer.recognize_google(audio, show_all=False)
             return text
-        except (sr.UnknownValueError, sr.RequestError):
+        except sr.UnknownValueError:
             return None
 
+    def ensure_loaded(self):
+        """
+        Load the speech model and run it once on a second of silence, so the first
+        real transcription does not pay for it. Nothing to load for Google.
+        """
+        if self.engine != "whisper":
+            return
+
+        silence = bytes(16000 * 2)
+        segments, info = self._get_model().transcribe(self._wav_buffer(silence, 16000, 2), vad_filter=False)
+        for _ in segments:  # Segments are decoded lazily
+            pass
+
+    @staticmethod
+    def _wav_buffer(audio_data: bytes, sample_rate: int, sample_width: int) -> io.BytesIO:
+        """Wrap raw mono PCM as an in-memory WAV, so faster-whisper resamples it to 16 kHz itself"""
+        buf = io.BytesIO()
+        with wave.open(buf, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(sample_width)
+            wf.setframerate(sample_rate)
+            wf.writeframes(audio_data)
+        buf.seek(0)
+        return buf
+
     def get_supported_languages(self) -> List[str]:
         """Get list of supported languages for transcription"""
         return ['en-US', 'en-GB', 'es-ES', 'fr-FR', 'de-DE', 'it-IT', 'pt-BR', 'ja-JP', 'ko-KR', 'zh-CN']
@@ -0,0 +1,155 @@
+"""
+Energy-based voice activity detection for Tabletop Notetaker
+"""
+
+import array
+import math
+import warnings
+from collections import deque
+from typing import List, Tuple
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop  # Deprecated in Python 3.11, removed in 3.13
+    except ImportError:
+        audioop = None
+
+
+# Length of a single analysis frame
+FRAME_MS = 30
+
+# Silence allowed inside a segment before it is closed
+SILENCE_TOLERANCE_MS = 300
+
+# Segment length bounds in seconds
+MIN_SEGMENT_SECONDS = 1.5
+MAX_SEGMENT_SECONDS = 10.0
+
+# Speech must be this many times louder than the noise floor, and never quieter
+# than MIN_ENERGY_THRESHOLD, for an adapted threshold (see noise_floor)
+NOISE_FLOOR_RATIO = 3.0
+MIN_ENERGY_THRESHOLD = 30.0
+
+_ARRAY_TYPECODES = {1: 'b', 2: 'h', 4: 'i'}
+
+
+def frame_rms(frame: bytes, sample_width: int) -> float:
+    """Root-mean-square energy of a frame of signed PCM samples"""
+    if audioop is not None:
+        return audioop.rms(frame, sample_width)
+
+    samples = array.array(_ARRAY_TYPECODES[sample_width], frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+def noise_floor(data: bytes, sample_rate: int, sample_width: int, channels: int = 1) -> float:
+    """
+    Estimate the background level of a recording as the 10th percentile of its
+    per-frame RMS energy, so thresholds can follow quiet recordings
+    """
+    frame_bytes = int(sample_rate * FRAME_MS / 1000) * sample_width * channels
+    view = memoryview(data)
+    levels = sorted(
+        frame_rms(view[pos:pos + frame_bytes], sample_width)
+        for pos in range(0, len(view) - frame_bytes + 1, frame_bytes)
+    )
+    return levels[len(levels) // 10] if levels else 0.0
+
+
+def adapted_threshold(data: bytes, sample_rate: int, sample_width: int, ceiling: float) -> float:
+    """Speech threshold for a recording: ceiling, lowered to suit a quiet noise floor"""
+    floor = noise_floor(data, sample_rate, sample_width)
+    return min(ceiling, max(floor * NOISE_FLOOR_RATIO, MIN_ENERGY_THRESHOLD))
+
+
+class SpeechSegmenter:
+    """
+    Streaming speech segmenter: raw PCM goes in through feed(), closed speech
+    segments come out as (start_seconds, end_seconds, pcm_bytes) tuples.
+
+    A frame counts as speech when its RMS energy reaches energy_threshold (the same
+    scale as speech_recognition's Recognizer.energy_threshold). A segment closes
+    after SILENCE_TOLERANCE_MS of silence once it is at least MIN_SEGMENT_SECONDS
+    long, or unconditionally at MAX_SEGMENT_SECONDS.
+    """
+
+    def __init__(self, sample_rate: int, sample_width: int = 2, channels: int = 1,
+                 energy_threshold: float = 300):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.energy_threshold = energy_threshold
+
+        self._bytes_per_second = sample_rate * sample_width * channels
+        self._frame_bytes = int(sample_rate * FRAME_MS / 1000) * sample_width * channels
+        self._tolerance_frames = SILENCE_TOLERANCE_MS // FRAME_MS
+        self._min_bytes = int(MIN_SEGMENT_SECONDS * self._bytes_per_second)
+        self._max_bytes = int(MAX_SEGMENT_SECONDS * self._bytes_per_second)
+
+        self._pending = bytearray()  # Input not yet making up a whole frame
+        self._offset = 0  # Stream position in bytes of the next frame
+        self._preroll = deque(maxlen=self._tolerance_frames)  # Silent frames before speech
+        self._segment = bytearray()
+        self._segment_start = 0
+        self._silent_frames = 0
+
+    def feed(self, data: bytes) -> List[Tuple[float, float, bytes]]:
+        """Consume raw PCM and return any speech segments that closed"""
+        closed = []
+        self._pending += data
+        frame_bytes = self._frame_bytes
+        pos = 0
+
+        while len(self._pending) - pos >= frame_bytes:
+            frame = bytes(self._pending[pos:pos + frame_bytes])
+            pos += frame_bytes
+            self._process_frame(frame, closed)
+
+        del self._pending[:pos]
+        return closed
+
+    def flush(self) -> List[Tuple[float, float, bytes]]:
+        """Close out the stream, returning the final segment if one is open"""
+        closed = []
+        if self._segment:
+            self._segment += self._pending
+            self._offset += len(self._pending)
+            self._close_segment(closed)
+        self._pending.clear()
+        return closed
+
+    def _process_frame(self, frame: bytes, closed: List[Tuple[float, float, bytes]]):
+        """Advance the segmenter state by one frame"""
+        is_speech = frame_rms(frame, self.sample_width) >= self.energy_threshold
+        self._offset += len(frame)
+
+        if not self._segment:
+            if is_speech:
+                # Keep a little leading audio so soft onsets are not clipped
+                preroll = b''.join(self._preroll)
+                self._preroll.clear()
+                self._segment_start = self._offset - len(frame) - len(preroll)
+                self._segment += preroll
+                self._segment += frame
+                self._silent_frames = 0
+            else:
+                self._preroll.append(frame)
+            return
+
+        self._segment += frame
+        self._silent_frames = 0 if is_speech else self._silent_frames + 1
+
+        if len(self._segment) >= self._max_bytes:
+            self._close_segment(closed)
+        elif self._silent_frames >= self._tolerance_frames and len(self._segment) >= self._min_bytes:
+            self._close_segment(closed)
+
+    def _close_segment(self, closed: List[Tuple[float, float, bytes]]):
+        """Emit the open segment"""
+        start = self._segment_start / self._bytes_per_second
+        end = (self._segment_start + len(self._segment)) / self._bytes_per_second
+        closed.append((start, end, bytes(self._segment)))
+        self._segment = bytearray()
+        self._silent_frames = 0
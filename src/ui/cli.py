@@ -62,6 +62,8 @@ class CLIInterface:
             except Exception as e:
                 print(f"Error: {e}")
 
+        self.app.close()
+
     def start_recording(self):
         """Start audio recording"""
         output_path = input("Enter output filename (or press Enter for auto-generated): ").strip()
@@ -142,21 +144,23 @@ class CLIInterface:
         if format_choice not in ['txt', 'md', 'json']:
             format_choice = 'txt'
 
-        summary = self.app.summarize_transcript(transcript, format_choice)
+        base_name = "meeting_summary"
+        output_path = f"{base_name}.{format_choice}"
 
-        if summary:
-            base_name = "meeting_summary"
-            output_path = f"{base_name}.{format_choice}"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(summary)
+        if self.app.save_summary(transcript, output_path, format_choice):
             print(f"Summary saved to: {output_path}")
         else:
             print("Summary generation failed.")
 
     def list_recordings(self):
         """List available recordings"""
-        recordings_dir = Path(".")
-        recordings = list(recordings_dir.glob("*.wav")) + list(recordings_dir.glob("*.mp3"))
+        # A single directory scan; DirEntry caches the stat result
+        with os.scandir(".") as it:
+            recordings = sorted(
+                (entry for entry in it
+                 if entry.name.lower().endswith(('.wav', '.mp3')) and entry.is_file()),
+                key=lambda entry: entry.name
+            )
 
         if not recordings:
             print("No recordings found.")
@@ -185,22 +189,15 @@ class CLIInterface:
         lines = content.split('\n')
 
         for line in lines:
-            line = line.strip()
-            if line and '[' in line and ']:' in line:
-                # Parse format: [Speaker]: text
-                try:
-                    speaker_end = line.find(']:')
-                    speaker = line[1:speaker_end].strip()
-                    text = line[speaker_end + 2:].strip()
-
-                    segments.append({
-                        'speaker': speaker,
-                        'text': text,
-                        'start': 0.0,  # Placeholder
-                        'end': 0.0    # Placeholder
-                    })
-                except:
-                    continue
+            # Parse format: [Speaker]: text
+            head, sep, text = line.strip().partition(']:')
+            if sep and head[:1] == '[':
+                segments.append({
+                    'speaker': head[1:].strip(),
+                    'text': text.strip(),
+                    'start': 0.0,  # Placeholder
+                    'end': 0.0    # Placeholder
+                })
 
         return {
             'segments': segments,
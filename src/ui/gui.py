@@ -2,37 +2,111 @@
 Graphical User Interface for Tabletop Notetaker
 """
 
-import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
+import math
+import os
+import queue
 import threading
 import time
+from concurrent.futures import Future
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from core.app import TabletopNotetakerApp
+if TYPE_CHECKING:
+    from core.app import TabletopNotetakerApp
+
+
+# Characters read at a time when loading a transcript file, and how many read
+# chunks may wait for the UI before the reader pauses
+LOAD_CHUNK_SIZE = 1 << 16
+LOAD_CHUNKS_IN_FLIGHT = 4
+
+# Longest the pump spends on queued widget updates before letting Tk redraw
+PUMP_BUDGET_SECONDS = 0.015
+
+# File dialog type filters, built once rather than on every click
+_AUDIO_TYPES = (("Audio files", "*.wav *.mp3 *.m4a"), ("All files", "*.*"))
+_TXT_TYPES = (("Text files", "*.txt"), ("All files", "*.*"))
+_SAVE_TYPES = (("Text files", "*.txt"), ("Markdown files", "*.md"), ("All files", "*.*"))
 
 
 class GUIInterface:
     """Graphical user interface for Tabletop Notetaker"""
 
-    def __init__(self, app: TabletopNotetakerApp):
+    __slots__ = (
+        'app', 'root', 'recording', 'current_file', 'current_transcript',
+        'main_frame', 'record_button', 'status_label', 'timer_label',
+        'transcribe_button', 'summarize_button', 'load_button', 'output_text', 'progress_label',
+        'timer_job', '_start_mono', '_last_timer_str', '_shown_xruns', '_summary_memo', '_ui_q', '_jobs',
+        '_tk', '_filedialog', '_messagebox', '_scrolledtext',
+    )
+
+    def __init__(self, app: 'TabletopNotetakerApp'):
         self.app = app
         self.root = None
         self.recording = False
         self.current_file = None
+        self.current_transcript = None
+        self._summary_memo = {}  # (id(transcript), format) -> summary of current_transcript
+
+        # Widgets, created by run()
+        self.main_frame = None
+        self.record_button = None
+        self.status_label = None
+        self.timer_label = None
+        self.transcribe_button = None
+        self.summarize_button = None
+        self.load_button = None
+        self.output_text = None
+        self.progress_label = None
+
+        self.timer_job = None
+        self._start_mono = 0.0
+        self._last_timer_str = None
+        self._shown_xruns = 0
+        self._ui_q = queue.Queue()  # Widget updates posted by worker threads
+        # One background job at a time, so clicks cannot pile up competing transcriptions,
+        # run on a daemon thread; closing the window cancels it, see _on_closing
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._run_jobs, name='ttnt-worker', daemon=True).start()
+        self._tk = None  # tkinter and its dialogs, imported by run()
+        self._filedialog = None
+        self._messagebox = None
+        self._scrolledtext = None
+
+        # Load the speech model while the window opens rather than on the first click
+        threading.Thread(target=self._warmup, daemon=True).start()
+
+    def _warmup(self):
+        """Load heavy transcription dependencies in the background"""
+        try:
+            self.app.transcription_service.ensure_loaded()
+        except Exception as e:
+            print(f"Could not preload transcription model: {e}")
 
     def run(self):
         """Start the GUI application"""
+        # Tk is imported here so importing this module stays cheap for the CLI and tests
+        import tkinter as tk
+        from tkinter import filedialog, messagebox, scrolledtext
+        self._tk = tk
+        self._filedialog = filedialog
+        self._messagebox = messagebox
+        self._scrolledtext = scrolledtext
+
         self.root = tk.Tk()
         self.root.title("Tabletop Notetaker")
         self.root.geometry("800x600")
 
         self._create_widgets()
         self._setup_layout()
+        self._pump()
 
         self.root.mainloop()
 
     def _create_widgets(self):
         """Create GUI widgets"""
+        tk, scrolledtext = self._tk, self._scrolledtext
+
         # Main frame
         self.main_frame = tk.Frame(self.root, padx=20, pady=20)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -65,14 +139,17 @@ class GUIInterface:
         buttons_frame = tk.Frame(file_frame)
         buttons_frame.pack(fill=tk.X)
 
-        tk.Button(buttons_frame, text="Transcribe Audio",
-                 command=self._transcribe_audio).pack(side=tk.LEFT, padx=(0, 10))
+        self.transcribe_button = tk.Button(buttons_frame, text="Transcribe Audio",
+                                           command=self._transcribe_audio)
+        self.transcribe_button.pack(side=tk.LEFT, padx=(0, 10))
 
-        tk.Button(buttons_frame, text="Summarize Transcript",
-                 command=self._summarize_transcript).pack(side=tk.LEFT, padx=(0, 10))
+        self.summarize_button = tk.Button(buttons_frame, text="Summarize Transcript",
+                                          command=self._summarize_transcript)
+        self.summarize_button.pack(side=tk.LEFT, padx=(0, 10))
 
-        tk.Button(buttons_frame, text="Load Transcript",
-                 command=self._load_transcript).pack(side=tk.LEFT, padx=(0, 10))
+        self.load_button = tk.Button(buttons_frame, text="Load Transcript",
+                                     command=self._load_transcript)
+        self.load_button.pack(side=tk.LEFT, padx=(0, 10))
 
         tk.Button(buttons_frame, text="Save Output",
                  command=self._save_output).pack(side=tk.LEFT)
@@ -93,6 +170,24 @@ class GUIInterface:
         """Setup the layout and event handlers"""
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
 
+    def _pump(self):
+        """Run widget updates queued by worker threads; Tk is only safe on the main thread"""
+        deadline = time.monotonic() + PUMP_BUDGET_SECONDS
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    fn = self._ui_q.get_nowait()
+                except queue.Empty:
+                    break
+                # One failed update must not stop the rest, or the pump itself
+                try:
+                    fn()
+                except Exception as e:
+                    print(f"UI update failed: {e}")
+        finally:
+            # Come straight back for a backlog, after Tk has had a chance to redraw
+            self.root.after(1 if not self._ui_q.empty() else 30, self._pump)
+
     def _toggle_recording(self):
         """Toggle recording on/off"""
         if not self.recording:
@@ -103,8 +198,10 @@ class GUIInterface:
     def _start_recording(self):
         """Start audio recording"""
         try:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"recording_{timestamp}.wav"
+            # Format the fields directly rather than going through locale-aware strftime
+            t = time.localtime(time.time_ns() // 1_000_000_000)
+            filename = (f"recording_{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}"
+                        f"_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}.wav")
 
             success = self.app.start_recording(filename)
             if success:
@@ -114,9 +211,9 @@ class GUIInterface:
                 self.status_label.config(text=f"Recording to: {filename}")
                 self._start_timer()
             else:
-                messagebox.showerror("Error", "Failed to start recording")
+                self._messagebox.showerror("Error", "Failed to start recording")
         except Exception as e:
-            messagebox.showerror("Error", f"Recording error: {e}")
+            self._messagebox.showerror("Error", f"Recording error: {e}")
 
     def _stop_recording(self):
         """Stop audio recording"""
@@ -127,143 +224,264 @@ class GUIInterface:
                 self.record_button.config(text="Start Recording", bg="green")
                 self.status_label.config(text=f"Recording saved: {result}")
                 self._stop_timer()
-                messagebox.showinfo("Success", f"Recording saved to: {result}")
+                self._messagebox.showinfo("Success", f"Recording saved to: {result}")
             else:
-                messagebox.showwarning("Warning", "No active recording to stop")
+                self._messagebox.showwarning("Warning", "No active recording to stop")
         except Exception as e:
-            messagebox.showerror("Error", f"Stop recording error: {e}")
+            self._messagebox.showerror("Error", f"Stop recording error: {e}")
 
     def _start_timer(self):
         """Start the recording timer"""
-        self.start_time = time.time()
+        self._start_mono = time.monotonic()  # Immune to wall-clock adjustments
+        self._last_timer_str = None
+        self._shown_xruns = 0
         self._update_timer()
 
     def _stop_timer(self):
         """Stop the recording timer"""
-        if hasattr(self, 'timer_job'):
+        if self.timer_job is not None:
             self.root.after_cancel(self.timer_job)
+            self.timer_job = None
 
     def _update_timer(self):
         """Update the timer display"""
         if self.recording:
-            elapsed = time.time() - self.start_time
+            elapsed = time.monotonic() - self._start_mono
             hours, remainder = divmod(int(elapsed), 3600)
             minutes, seconds = divmod(remainder, 60)
-            time_str = "02d"
-            self.timer_label.config(text=time_str)
-            self.timer_job = self.root.after(1000, self._update_timer)
+            time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            if time_str != self._last_timer_str:
+                self.timer_label.config(text=time_str)
+                self._last_timer_str = time_str
+                self._update_xruns()
+
+            # Fire just after the next whole second so the display never drifts
+            delay_ms = max(10, math.ceil(1000 - (elapsed * 1000) % 1000) + 1)
+            self.timer_job = self.root.after(delay_ms, self._update_timer)
+
+    def _update_xruns(self):
+        """Show how many audio chunks were dropped because the disk fell behind"""
+        xruns = self.app.get_recording_status()['xruns']
+        if xruns != self._shown_xruns:
+            self._shown_xruns = xruns
+            self.status_label.config(text=f"Recording to: {self.current_file} ({xruns} chunks dropped)")
 
     def _transcribe_audio(self):
         """Transcribe selected audio file"""
-        file_path = filedialog.askopenfilename(
+        file_path = self._filedialog.askopenfilename(
             title="Select Audio File",
-            filetypes=[("Audio files", "*.wav *.mp3 *.m4a"), ("All files", "*.*")]
+            filetypes=_AUDIO_TYPES
         )
 
         if not file_path:
             return
 
         self.progress_label.config(text="Transcribing audio...")
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, "Starting transcription...\n")
+        self.output_text.delete(1.0, self._tk.END)
+        self.output_text.insert(self._tk.END, "Starting transcription...\n")
 
-        # Run transcription in background thread
-        def transcribe_thread():
+        # Run transcription on the background worker
+        def transcribe_job():
+            ui = self._ui_q.put
             try:
                 transcript = self.app.transcribe_audio(file_path)
                 if transcript:
-                    self._display_transcript(transcript)
-                    self.current_transcript = transcript
+                    ui(lambda: self._show_transcript(transcript))
                 else:
-                    self.output_text.insert(tk.END, "Transcription failed.\n")
+                    ui(lambda: self.output_text.insert(self._tk.END, "Transcription failed.\n"))
             except Exception as e:
-                self.output_text.insert(tk.END, f"Error: {e}\n")
-            finally:
-                self.progress_label.config(text="")
+                ui(lambda e=e: self.output_text.insert(self._tk.END, f"Error: {e}\n"))
 
-        threading.Thread(target=transcribe_thread, daemon=True).start()
+        self._submit(transcribe_job)
 
     def _summarize_transcript(self):
         """Summarize current transcript"""
-        if not hasattr(self, 'current_transcript'):
-            messagebox.showwarning("Warning", "No transcript loaded. Please transcribe audio first.")
+        if self.current_transcript is None:
+            self._messagebox.showwarning("Warning", "No transcript loaded. Please transcribe audio first.")
+            return
+
+        # Rereading the summary of an unchanged transcript needs no work at all
+        key = (id(self.current_transcript), 'md')
+        if key in self._summary_memo:
+            self._replace_output(self._summary_memo[key])
             return
 
         self.progress_label.config(text="Generating summary...")
+        transcript = self.current_transcript
 
-        def summarize_thread():
+        def summarize_job():
+            ui = self._ui_q.put
             try:
-                summary = self.app.summarize_transcript(self.current_transcript, "md")
-                self.output_text.delete(1.0, tk.END)
-                self.output_text.insert(tk.END, summary)
+                summary = self.app.summarize_transcript(transcript, "md")
+                ui(lambda: self._show_summary(key, transcript, summary))
             except Exception as e:
-                self.output_text.insert(tk.END, f"Error: {e}\n")
-            finally:
-                self.progress_label.config(text="")
+                ui(lambda e=e: self.output_text.insert(self._tk.END, f"Error: {e}\n"))
 
-        threading.Thread(target=summarize_thread, daemon=True).start()
+        self._submit(summarize_job)
 
     def _load_transcript(self):
         """Load transcript from file"""
-        file_path = filedialog.askopenfilename(
+        file_path = self._filedialog.askopenfilename(
             title="Select Transcript File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=_TXT_TYPES
         )
 
         if not file_path:
             return
 
+        self.output_text.delete(1.0, self._tk.END)
+        self.progress_label.config(text="Loading transcript...")
+
+        # Read in chunks on the background worker, so large files load without freezing
+        # the window. The reader waits while LOAD_CHUNKS_IN_FLIGHT chunks are still
+        # queued, so it runs at the UI's pace and memory stays bounded
+        slots = threading.Semaphore(LOAD_CHUNKS_IN_FLIGHT)
+
+        def load_job():
+            ui = self._ui_q.put
+            loaded = 0
+            try:
+                with open(file_path, 'r', encoding='utf-8', buffering=LOAD_CHUNK_SIZE) as f:
+                    for chunk in iter(lambda: f.read(LOAD_CHUNK_SIZE), ''):
+                        loaded += len(chunk)
+                        slots.acquire()
+                        ui(lambda c=chunk, n=loaded: self._append_loaded(c, n, slots))
+            except Exception as e:
+                ui(lambda e=e: self._messagebox.showerror("Error", f"Failed to load file: {e}"))
+
+        self._submit(load_job)
+
+    def _append_loaded(self, chunk: str, loaded: int, slots: threading.Semaphore):
+        """Append a chunk of a file being loaded and show progress"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.output_text.delete(1.0, tk.END)
-            self.output_text.insert(tk.END, content)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file: {e}")
+            self.output_text.insert(self._tk.END, chunk)
+            self.progress_label.config(text=f"Loading transcript... {loaded:,} characters")
+        finally:
+            slots.release()  # Let the reader fetch the next chunk
 
     def _save_output(self):
         """Save current output to file"""
-        content = self.output_text.get(1.0, tk.END).strip()
+        content = self.output_text.get(1.0, self._tk.END).strip()
         if not content:
-            messagebox.showwarning("Warning", "No content to save.")
+            self._messagebox.showwarning("Warning", "No content to save.")
             return
 
-        file_path = filedialog.asksaveasfilename(
+        file_path = self._filedialog.asksaveasfilename(
             title="Save Output",
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("Markdown files", "*.md"), ("All files", "*.*")]
+            filetypes=_SAVE_TYPES
         )
 
-        if file_path:
+        if not file_path:
+            return
+
+        # Encode and write on the background worker; only the result dialog runs here
+        def save_job():
+            ui = self._ui_q.put
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                messagebox.showinfo("Success", f"File saved to: {file_path}")
+                self._write_file(file_path, content.encode('utf-8'))
+                ui(lambda: self._messagebox.showinfo("Success", f"File saved to: {file_path}"))
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to save file: {e}")
+                ui(lambda e=e: self._messagebox.showerror("Error", f"Failed to save file: {e}"))
+
+        self._submit(save_job)
+
+    @staticmethod
+    def _write_file(path: str, data: bytes):
+        """Write bytes straight to a file descriptor and flush them to disk"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]  # os.write may write less than asked
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _submit(self, job):
+        """Run job on the background worker, with the job buttons disabled until it finishes"""
+        self._set_jobs_enabled(False)
+        future = Future()
+        future.add_done_callback(lambda f: self._ui_q.put(lambda: self._on_done(f)))
+        self._jobs.put((job, future))
+
+    def _run_jobs(self):
+        """Worker thread: run submitted jobs one at a time until the None sentinel"""
+        for job, future in iter(self._jobs.get, None):
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _on_done(self, future: Future):
+        """Restore the controls after a background job finishes"""
+        self._set_jobs_enabled(True)
+        self.progress_label.config(text="")
+        if future.exception():
+            self.output_text.insert(self._tk.END, f"Error: {future.exception()}\n")
+
+    def _set_jobs_enabled(self, enabled: bool):
+        """Enable or disable the buttons that start background jobs"""
+        state = self._tk.NORMAL if enabled else self._tk.DISABLED
+        for button in (self.transcribe_button, self.summarize_button, self.load_button):
+            button.config(state=state)
+
+    def _show_transcript(self, transcript: dict):
+        """Display a finished transcript and make it the one to summarize"""
+        self._display_transcript(transcript)
+        self.current_transcript = transcript
+        self._summary_memo.clear()
+
+    def _show_summary(self, key: tuple, transcript: dict, summary: str):
+        """Display a finished summary, remembering it while its transcript is current"""
+        if summary and transcript is self.current_transcript:
+            self._summary_memo[key] = summary
+        self._replace_output(summary)
+
+    def _replace_output(self, content: str):
+        """Replace the contents of the output area"""
+        self.output_text.delete(1.0, self._tk.END)
+        self.output_text.insert(self._tk.END, content)
 
     def _display_transcript(self, transcript: dict):
         """Display transcript in the output area"""
-        self.output_text.delete(1.0, tk.END)
+        self.output_text.delete(1.0, self._tk.END)
 
         segments = transcript.get('segments', [])
         if not segments:
-            self.output_text.insert(tk.END, "No transcript content.\n")
+            self.output_text.insert(self._tk.END, "No transcript content.\n")
             return
 
+        # One insert for the whole transcript instead of a widget update per line;
+        # each text is stripped once and the pieces are joined in a single pass
+        parts = []
+        append = parts.append
         for segment in segments:
-            speaker = segment.get('speaker', 'Unknown')
-            text = segment.get('text', '').strip()
+            text = segment.get('text')
+            if text:
+                text = text.strip()
             if text:
-                self.output_text.insert(tk.END, f"[{speaker}]: {text}\n")
+                append('[')
+                append(str(segment.get('speaker', 'Unknown')))  # As the f-string used to
+                append(']: ')
+                append(text)
+                append('\n')
+        self.output_text.insert(self._tk.END, ''.join(parts))
 
     def _on_closing(self):
         """Handle window closing"""
         if self.recording:
-            if messagebox.askyesno("Recording in Progress",
+            if self._messagebox.askyesno("Recording in Progress",
                                  "Recording is in progress. Stop and exit?"):
                 self._stop_recording()
             else:
                 return
 
+        # A job still running is abandoned with the daemon worker thread. Transcription
+        # is cancelled too: its recognition threads are not daemons, and exit waits
+        # for them, but only for the few requests already sent
+        self.app.close()
+        self._jobs.put(None)
         self.root.destroy()
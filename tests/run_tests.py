@@ -3,103 +3,91 @@
 Simple test runner for Tabletop Notetaker (works without pytest)
 """
 
+import io
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Add src to path, once
+src_path = str(Path(__file__).parent.parent / "src")
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+import test_app
+
+
+class _ThreadBufferedStdout:
+    """
+    Stand-in for sys.stdout that collects each test's output separately, so the
+    lines tests print from worker threads come out grouped rather than interleaved
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        return (buf or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def capture(self, test_func):
+        """Run a test on the current thread, returning (output, exception or None)"""
+        self._local.buf = io.StringIO()
+        try:
+            test_func()
+            error = None
+        except Exception as e:
+            error = e
+        finally:
+            output = self._local.buf.getvalue()
+            self._local.buf = None
+        return output, error
+
 
 def run_tests():
     """Run all tests manually"""
     print("Running Tabletop Notetaker tests...\n")
 
+    # The suite itself lives in test_app.py, so pytest and this runner share it
     test_functions = [
-        test_core_imports,
-        test_app_initialization,
-        test_cli_import,
-        test_gui_import,
-        test_services_initialization,
-        test_summarization_functionality
+        func for name, func in vars(test_app).items()
+        if name.startswith('test_') and callable(func)
     ]
 
     passed = 0
     failed = 0
 
-    for test_func in test_functions:
-        try:
-            print(f"Running {test_func.__name__}...")
-            test_func()
-            print(f"✓ {test_func.__name__} PASSED\n")
-            passed += 1
-        except Exception as e:
-            print(f"✗ {test_func.__name__} FAILED: {e}\n")
-            failed += 1
+    # The tests are independent, so run them side by side to overlap their slow
+    # imports. Each test's own output is captured on its worker thread and printed
+    # from this thread, together with its result, as the test finishes
+    stdout = _ThreadBufferedStdout(sys.stdout)
+    workers = min(len(test_functions), os.cpu_count() or 1)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(stdout.capture, test_func): test_func.__name__
+                       for test_func in test_functions}
+            for future in as_completed(futures):
+                name = futures[future]
+                output, error = future.result()
+                print(output, end="")
+                if error is None:
+                    print(f"✓ {name} PASSED\n")
+                    passed += 1
+                else:
+                    print(f"✗ {name} FAILED: {error}\n")
+                    failed += 1
+    finally:
+        sys.stdout = stdout._stream
 
     print(f"Results: {passed} passed, {failed} failed")
     return failed == 0
 
-def test_core_imports():
-    """Test that core modules can be imported"""
-    from core.app import TabletopNotetakerApp
-    from services.recording_service import RecordingService
-    from services.transcription_service import TranscriptionService
-    from services.summarization_service import SummarizationService
-
-def test_app_initialization():
-    """Test that the main app can be initialized"""
-    from core.app import TabletopNotetakerApp
-    app = TabletopNotetakerApp()
-    assert app is not None
-    assert hasattr(app, 'recording_service')
-    assert hasattr(app, 'transcription_service')
-    assert hasattr(app, 'summarization_service')
-
-def test_cli_import():
-    """Test CLI interface import"""
-    from ui.cli import CLIInterface
-
-def test_gui_import():
-    """Test GUI interface import (may fail if tkinter not available)"""
-    try:
-        import tkinter
-        from ui.gui import GUIInterface
-    except ImportError:
-        print("GUI not available (tkinter not found) - skipping GUI tests")
-        # Don't raise exception, just skip
-
-def test_services_initialization():
-    """Test that all services can be initialized"""
-    from services.recording_service import RecordingService
-    from services.transcription_service import TranscriptionService
-    from services.summarization_service import SummarizationService
-
-    recording = RecordingService()
-    transcription = TranscriptionService()
-    summarization = SummarizationService()
-
-    assert recording is not None
-    assert transcription is not None
-    assert summarization is not None
-
-def test_summarization_functionality():
-    """Test summarization service with sample data"""
-    from services.summarization_service import SummarizationService
-
-    service = SummarizationService()
-
-    # Sample transcript data
-    sample_transcript = {
-        'segments': [
-            {'speaker': 'Alice', 'text': 'Hello everyone, let\'s start the meeting.', 'start': 0, 'end': 5},
-            {'speaker': 'Bob', 'text': 'I think we should discuss the new project timeline.', 'start': 6, 'end': 12},
-            {'speaker': 'Alice', 'text': 'Good idea. We need to finish by next Friday.', 'start': 13, 'end': 18}
-        ]
-    }
-
-    summary = service.summarize(sample_transcript, 'txt')
-    assert summary is not None
-    assert len(summary) > 0
-
 if __name__ == "__main__":
     success = run_tests()
     sys.exit(0 if success else 1)
@@ -6,9 +6,6 @@ import sys
 import os
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 def test_core_imports():
     """Test that core modules can be imported"""
     try:
@@ -104,8 +101,590 @@ def test_summarization_functionality():
         print(f"✗ Summarization test failed: {e}")
         assert False, f"Summarization test failed: {e}"
 
+def test_action_item_detection():
+    """Test that action items match whole words regardless of case"""
+    try:
+        from services.summarization_service import SummarizationService
+
+        service = SummarizationService()
+        data = service._extract_summary_data([
+            {'speaker': 'Alice', 'text': 'TODO: book the venue for Saturday.'},
+            {'speaker': 'Bob', 'text': 'I am willing to bring snacks.'},
+            {'speaker': 'Carol', 'text': 'We Need To pick a new campaign.'},
+            {'speaker': 'Dave', 'text': 'The cleric WILL scout ahead.'},
+            {'speaker': 'Erin', 'text': 'No transactions today.'}
+        ])
+
+        assert data['action_items'] == [
+            'Alice: TODO: book the venue for Saturday.',
+            'Carol: We Need To pick a new campaign.',
+            'Dave: The cleric WILL scout ahead.'
+        ]
+
+        print("✓ Action item detection test successful")
+    except Exception as e:
+        print(f"✗ Action item detection test failed: {e}")
+        assert False, f"Action item detection test failed: {e}"
+
+def test_speaker_order():
+    """Test that participants are listed in order of first appearance"""
+    try:
+        from services.summarization_service import SummarizationService
+
+        service = SummarizationService()
+        data = service._extract_summary_data([
+            {'speaker': 'Carol', 'text': 'Roll for initiative.'},
+            {'speaker': 'Alice', 'text': 'I go first.'},
+            {'speaker': 'Carol', 'text': 'The goblins attack.'},
+            {'speaker': 'Bob', 'text': 'I cast shield.'}
+        ])
+
+        assert data['speakers'] == ['Carol', 'Alice', 'Bob']
+
+        print("✓ Speaker order test successful")
+    except Exception as e:
+        print(f"✗ Speaker order test failed: {e}")
+        assert False, f"Speaker order test failed: {e}"
+
+def test_transcript_file_parsing():
+    """Test parsing of saved plain text transcripts"""
+    try:
+        from ui.cli import CLIInterface
+
+        cli = CLIInterface(None)
+        transcript = cli._parse_transcript_file(
+            "Meeting Transcript\n"
+            "Date: 2025-09-10 14:30:00\n"
+            "\n"
+            "[Speaker 1]: We should rest at the inn.\n"
+            "  [Speaker 2]:   Agreed.  \n"
+            "Note [not a speaker]: ignored\n"
+        )
+
+        assert transcript['segments'] == [
+            {'speaker': 'Speaker 1', 'text': 'We should rest at the inn.', 'start': 0.0, 'end': 0.0},
+            {'speaker': 'Speaker 2', 'text': 'Agreed.', 'start': 0.0, 'end': 0.0}
+        ]
+        assert transcript['duration'] == 20
+
+        print("✓ Transcript parsing test successful")
+    except Exception as e:
+        print(f"✗ Transcript parsing test failed: {e}")
+        assert False, f"Transcript parsing test failed: {e}"
+
+def test_incremental_summary():
+    """Test that feeding segments one at a time matches summarizing them all at once"""
+    try:
+        from services.summarization_service import SummarizationService
+
+        service = SummarizationService()
+        segments = [
+            {'speaker': 'Alice', 'text': 'The dragon guards the treasure in the northern'},
+            {'speaker': 'Bob', 'text': 'mountains, so we need to prepare carefully. The dragon is old.'},
+            {'speaker': 'Alice', 'text': ''},
+            {'speaker': 'Carol', 'text': 'Then we should buy potions before the treasure hunt'}
+        ]
+
+        summary = service.new_summary()
+        for segment in segments:
+            summary.add(segment)
+        data = summary.finalize()
+
+        assert data == service._extract_summary_data(segments)
+        assert data['total_segments'] == 4
+        assert data['summary_text'].startswith(
+            'The dragon guards the treasure in the northern mountains, so we need to prepare carefully')
+        assert data['keywords'][:2] == ['dragon', 'treasure']
+
+        print("✓ Incremental summary test successful")
+    except Exception as e:
+        print(f"✗ Incremental summary test failed: {e}")
+        assert False, f"Incremental summary test failed: {e}"
+
+def test_speech_segmentation():
+    """Test that the energy VAD drops silence and bounds segment length"""
+    try:
+        import struct
+        from services.vad import SpeechSegmenter
+
+        rate = 16000
+        silence = b'\x00\x00' * rate  # 1 second
+        speech = struct.pack('<2h', 3000, -3000) * (rate // 2)  # 1 second
+        audio = silence * 3 + speech * 2 + silence * 3 + speech * 12 + silence
+
+        segmenter = SpeechSegmenter(rate, 2, energy_threshold=300)
+        segments = segmenter.feed(audio[:12345]) + segmenter.feed(audio[12345:]) + segmenter.flush()
+
+        assert len(segments) == 3
+        starts = [round(start, 1) for start, _, _ in segments]
+        assert starts == [2.7, 7.7, 17.7]  # 300 ms of leading audio is kept
+        for start, end, raw in segments:
+            assert end - start <= 10.1
+            assert len(raw) == round((end - start) * rate * 2)
+
+        print("✓ Speech segmentation test successful")
+    except Exception as e:
+        print(f"✗ Speech segmentation test failed: {e}")
+        assert False, f"Speech segmentation test failed: {e}"
+
+def test_quiet_audio_chunks():
+    """Test that quiet recordings are still split into speech, or sent whole in windows"""
+    try:
+        import struct
+        import speech_recognition as sr
+        from services.transcription_service import TranscriptionService
+
+        rate = 16000
+        hiss = struct.pack('<2h', 20, -20) * (rate // 2)  # 1 second
+        speech = struct.pack('<2h', 250, -250) * (rate // 2)  # 1 second, below the default 300
+        service = TranscriptionService(engine="google")
+
+        chunks = service._speech_chunks(sr.AudioData(hiss * 2 + speech * 3 + hiss * 3, rate, 2))
+        assert [round(start, 1) for start, _, _ in chunks] == [1.7]
+
+        # Nothing rises above the floor, so the whole recording goes out in 10 s windows
+        chunks = service._speech_chunks(sr.AudioData(hiss * 25, rate, 2))
+        assert [(start, end) for start, end, _ in chunks] == [(0.0, 10.0), (10.0, 20.0), (20.0, 25.0)]
+
+        print("✓ Quiet audio chunking test successful")
+    except Exception as e:
+        print(f"✗ Quiet audio chunking test failed: {e}")
+        assert False, f"Quiet audio chunking test failed: {e}"
+
+def test_transcription_cancel():
+    """Test that cancelling stops segmented transcription sending more audio"""
+    try:
+        import threading
+        import time
+        from services.transcription_service import TranscriptionService, MAX_WORKERS
+
+        service = TranscriptionService(engine="google")
+        sent = []
+        lock = threading.Lock()
+
+        def fake_chunk(start, end, audio):
+            with lock:
+                sent.append(start)
+            time.sleep(0.01)
+            return {'start': start, 'end': end, 'speaker': 'Speaker 1', 'text': 'hello', 'confidence': 1.0}
+
+        service._transcribe_chunk_audio = fake_chunk
+        segments = service._transcribe_segmented([(float(i), i + 1.0, None) for i in range(100)], 100.0)
+        assert next(segments)['start'] == 0.0
+        service.cancel()
+        try:
+            next(segments)
+            assert False, "cancelled transcription kept going"
+        except RuntimeError:
+            pass
+        assert len(sent) <= MAX_WORKERS + 1, f"{len(sent)} chunks sent"
+
+        print("✓ Transcription cancel test successful")
+    except Exception as e:
+        print(f"✗ Transcription cancel test failed: {e}")
+        assert False, f"Transcription cancel test failed: {e}"
+
+def test_keyword_tokenizer():
+    """Test that the ASCII tokenizer fast path matches the regex tokenizer"""
+    try:
+        from services.summarization_service import _tokenize, _WORD_RE
+
+        samples = [
+            "The party's Wizard cast FIREBALL at 3 goblins_and_a troll!",
+            "  multiple   spaces\tand\nnewlines -- dashes... ",
+            "Café crème and naïve résumé",  # Non-ASCII takes the regex path
+            ""
+        ]
+        for text in samples:
+            assert _tokenize(text) == _WORD_RE.findall(text.lower()), text
+
+        print("✓ Keyword tokenizer test successful")
+    except Exception as e:
+        print(f"✗ Keyword tokenizer test failed: {e}")
+        assert False, f"Keyword tokenizer test failed: {e}"
+
+def test_transcript_cache():
+    """Test that transcripts are cached by audio content across cache instances"""
+    try:
+        import tempfile
+        from services.cache import TranscriptCache
+        from services.transcription_service import TranscriptionService, WHISPER_MODEL
+
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Path(tmp) / "first.wav"
+            copy = Path(tmp) / "copy.wav"
+            other = Path(tmp) / "other.wav"
+            first.write_bytes(b"RIFF audio")
+            copy.write_bytes(b"RIFF audio")
+            other.write_bytes(b"RIFF other audio")
+
+            cache = TranscriptCache(Path(tmp) / "cache", max_entries=1)
+            transcript = {'segments': [{'speaker': 'Alice', 'text': 'Roll initiative.'}]}
+            cache.set(cache.key_for(str(first), "google"), transcript)
+
+            assert cache.key_for(str(first), "google") == cache.key_for(str(copy), "google")
+            assert cache.key_for(str(first), "google") != cache.key_for(str(first), "whisper")
+
+            # Switching whisper models must not serve the other model's transcript
+            small = cache.key_for(str(first), "whisper-small")
+            assert small != cache.key_for(str(first), "whisper-large-v3")
+            assert small != cache.key_for(str(first), "whisper-small-v2")
+            assert "/" not in cache.key_for(str(first), "whisper-Systran/faster-whisper-large-v3")
+
+            assert TranscriptionService(engine="whisper").model_id == f"whisper-{WHISPER_MODEL}"
+            assert TranscriptionService(engine="google").model_id == "google"
+            assert cache.get(cache.key_for(str(other), "google")) is None
+
+            reloaded = TranscriptCache(Path(tmp) / "cache", max_entries=1)
+            assert reloaded.get(reloaded.key_for(str(copy), "google")) == transcript
+
+            key, hit = reloaded.lookup(str(first), "google")
+            assert key == reloaded.key_for(str(first), "google") and hit == transcript
+            assert reloaded.lookup(str(first), "whisper")[1] is None
+
+            # Least recently used entries are evicted from disk, but never the
+            # near-duplicate index, which lives in its own directory
+            index_file = Path(tmp) / "cache" / "fingerprints" / "index.json"
+            index_file.parent.mkdir()
+            index_file.write_text("[]")
+            reloaded.set(reloaded.key_for(str(other), "google"), transcript)
+            assert len(list((Path(tmp) / "cache").glob("*.json"))) == 1
+            assert index_file.exists()
+
+        print("✓ Transcript cache test successful")
+    except Exception as e:
+        print(f"✗ Transcript cache test failed: {e}")
+        assert False, f"Transcript cache test failed: {e}"
+
+def test_summary_cache():
+    """Test that summary data is reused for an identical transcript"""
+    try:
+        import tempfile
+        from services.cache import SummaryCache
+        from services.summarization_service import SummarizationService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            transcript = {
+                'duration': 30.0,
+                'segments': [
+                    {'speaker': 'Alice', 'text': 'We need to find the dragon before the next full moon.'},
+                    {'speaker': 'Bob', 'text': 'The dragon lair is somewhere past the mountains.'}
+                ]
+            }
+            cache = SummaryCache(Path(tmp))
+            service = SummarizationService(cache)
+            first = service.summarize(transcript, "md")
+
+            key = cache.key_for(transcript['segments'])
+            assert cache.get(key)['speakers'] == ['Alice', 'Bob']
+            assert service.summarize(transcript, "md") == first
+
+            # Same words from another speaker is a different transcript
+            renamed = [dict(seg, speaker='Carol') for seg in transcript['segments']]
+            assert cache.key_for(renamed) != key
+
+            # Fresh instance reads the entry back from disk
+            assert SummaryCache(Path(tmp)).get(key) == cache.get(key)
+
+        print("✓ Summary cache test successful")
+    except Exception as e:
+        print(f"✗ Summary cache test failed: {e}")
+        assert False, f"Summary cache test failed: {e}"
+
+def test_transcribe_and_summarize():
+    """Test the overlapped transcription and summary pipeline, including a failure mid-stream"""
+    try:
+        import tempfile
+        import wave
+        from core.app import TabletopNotetakerApp
+        from services.cache import TranscriptCache, SummaryCache
+
+        segments = [
+            {'start': 0.0, 'end': 2.0, 'speaker': 'Alice', 'text': 'We need to find the dragon before the full moon.'},
+            {'start': 2.0, 'end': 4.0, 'speaker': 'Bob', 'text': 'The dragon lair is somewhere past the mountains.'}
+        ]
+
+        def good_segments(audio_path):
+            yield from segments
+
+        def failing_segments(audio_path):
+            yield segments[0]
+            raise RuntimeError("recognizer went away")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            audio_path = str(Path(tmp) / "session.wav")
+            with wave.open(audio_path, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(8000)
+                wf.writeframes(b'\x00\x00' * 8000)
+
+            app = TabletopNotetakerApp()
+            app.transcription_service.engine = "google"
+            app.transcript_cache = TranscriptCache(Path(tmp) / "transcripts")
+            app.summarization_service.cache = SummaryCache(Path(tmp) / "summaries")
+
+            app.transcription_service.iter_segments = failing_segments
+            transcript, summary = app.transcribe_and_summarize(audio_path, "md")
+            assert 'recognizer went away' in transcript['error']
+            assert summary == "No transcript content to summarize."
+            assert app.transcript_cache.lookup(audio_path, "google")[1] is None  # Failures are retried
+
+            # Hearing nothing is retried too, rather than caching the placeholder
+            app.transcription_service.iter_segments = lambda path: iter([
+                {'start': 0.0, 'end': 1.0, 'speaker': 'Unknown', 'text': '[Inaudible]', 'confidence': 0.0}])
+            app.transcribe_and_summarize(audio_path, "md")
+            assert app.transcript_cache.lookup(audio_path, "google")[1] is None
+
+            app.transcription_service.iter_segments = good_segments
+            transcript, summary = app.transcribe_and_summarize(audio_path, "md")
+            assert transcript['segments'] == segments
+            assert "Alice" in summary and "dragon" in summary
+            # Same notes as summarizing afterwards; only the date line may differ
+            assert summary.split("\n", 3)[3] == app.summarize_transcript(transcript, "md").split("\n", 3)[3]
+
+            # The finished transcript is cached for the next run
+            app.transcription_service.iter_segments = failing_segments
+            assert app.transcribe_and_summarize(audio_path, "md")[0]['segments'] == segments
+
+        print("✓ Transcribe and summarize test successful")
+    except Exception as e:
+        print(f"✗ Transcribe and summarize test failed: {e}")
+        assert False, f"Transcribe and summarize test failed: {e}"
+
+def test_live_transcription_default():
+    """Test that recordings are only transcribed live with the local engine"""
+    try:
+        from core.app import TabletopNotetakerApp
+
+        previous = os.environ.get("TRANSCRIPTION_ENGINE")
+        try:
+            os.environ["TRANSCRIPTION_ENGINE"] = "google"
+            assert TabletopNotetakerApp().live_transcription is False
+            assert TabletopNotetakerApp(live_transcription=True).live_transcription is True
+            os.environ["TRANSCRIPTION_ENGINE"] = "whisper"
+            assert TabletopNotetakerApp().live_transcription is True
+        finally:
+            if previous is None:
+                os.environ.pop("TRANSCRIPTION_ENGINE", None)
+            else:
+                os.environ["TRANSCRIPTION_ENGINE"] = previous
+
+        print("✓ Live transcription default test successful")
+    except Exception as e:
+        print(f"✗ Live transcription default test failed: {e}")
+        assert False, f"Live transcription default test failed: {e}"
+
+def test_app_close():
+    """Test that closing the app stops live transcription, even with segments still arriving"""
+    try:
+        from core.app import TabletopNotetakerApp
+
+        app = TabletopNotetakerApp(live_transcription=True)
+        app.transcription_service.transcribe_chunk = lambda pcm, rate, width: "hello"
+        app._start_live_transcription()
+        chunk_queue = app.recording_service.chunk_queue
+        feeder, pending = app._live_feeder, app._pending
+
+        app.close()
+        assert app._live_executor is None
+
+        # A segment that closes after shutdown is dropped, not sent or crashed on
+        chunk_queue.put((0.0, 1.0, b'\x00\x00' * 16000))
+        chunk_queue.put(None)
+        assert feeder.result(timeout=5) is None
+        assert pending == []
+
+        print("✓ App close test successful")
+    except Exception as e:
+        print(f"✗ App close test failed: {e}")
+        assert False, f"App close test failed: {e}"
+
+def test_gui_update_pump():
+    """Test that a failing queued widget update neither stops the others nor the pump"""
+    try:
+        from types import SimpleNamespace
+        from ui.gui import GUIInterface
+
+        scheduled = []
+        app = SimpleNamespace(transcription_service=SimpleNamespace(ensure_loaded=lambda: None))
+        gui = GUIInterface(app)
+        gui.root = SimpleNamespace(after=lambda ms, fn: scheduled.append((ms, fn)))
+
+        ran = []
+
+        def broken():
+            raise TypeError("bad segment")
+
+        gui._ui_q.put(broken)
+        gui._ui_q.put(lambda: ran.append("next"))
+        gui._pump()
+
+        assert ran == ["next"]
+        assert scheduled and scheduled[-1][1] == gui._pump
+        gui._jobs.put(None)
+
+        print("✓ GUI update pump test successful")
+    except Exception as e:
+        print(f"✗ GUI update pump test failed: {e}")
+        assert False, f"GUI update pump test failed: {e}"
+
+def test_gui_transcript_loading():
+    """Test that loading a transcript runs at the UI's pace and spreads out over pump ticks"""
+    try:
+        import tempfile
+        import time
+        from types import SimpleNamespace
+        from ui import gui as gui_module
+        from ui.gui import GUIInterface, LOAD_CHUNK_SIZE, LOAD_CHUNKS_IN_FLIGHT
+
+        inserted = []
+        scheduled = []
+        widget = SimpleNamespace(config=lambda **kw: None)
+        app = SimpleNamespace(transcription_service=SimpleNamespace(ensure_loaded=lambda: None))
+        gui = GUIInterface(app)
+        gui.root = SimpleNamespace(after=lambda ms, fn: scheduled.append(ms))
+        gui._tk = SimpleNamespace(END='end', NORMAL='normal', DISABLED='disabled')
+        gui.output_text = SimpleNamespace(delete=lambda *a: inserted.clear(),
+                                          insert=lambda index, text: inserted.append(text))
+        gui.progress_label = gui.transcribe_button = gui.summarize_button = gui.load_button = widget
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "long_transcript.txt"
+            content = "[Alice]: Roll for initiative.\n" * (LOAD_CHUNK_SIZE // 2)  # ~15 chunks
+            path.write_text(content, encoding='utf-8')
+            gui._filedialog = SimpleNamespace(askopenfilename=lambda **kw: str(path))
+
+            gui._load_transcript()
+            time.sleep(0.2)
+            assert gui._ui_q.qsize() <= LOAD_CHUNKS_IN_FLIGHT  # The reader waits for the UI
+
+            # A slow update uses up the tick's budget; the rest waits for the next tick
+            gui._ui_q.put(lambda: time.sleep(gui_module.PUMP_BUDGET_SECONDS * 2))
+            gui._pump()
+            assert scheduled[-1] == 1
+
+            deadline = time.monotonic() + 10
+            while ''.join(inserted) != content and time.monotonic() < deadline:
+                gui._pump()
+                time.sleep(0.001)
+            assert ''.join(inserted) == content
+
+        print("✓ GUI transcript loading test successful")
+    except Exception as e:
+        print(f"✗ GUI transcript loading test failed: {e}")
+        assert False, f"GUI transcript loading test failed: {e}"
+
+def test_recording_capture():
+    """Test capture to WAV across spills, dropped chunks, and empty recordings without a device"""
+    try:
+        import tempfile
+        import threading
+        import time
+        import wave
+        from services import recording_service
+        from services.recording_service import RecordingService, CAPTURE_QUEUE_CHUNKS
+
+        class FakeStream:
+            def __init__(self, callback):
+                self.callback = callback
+
+            def stop_stream(self):
+                pass
+
+            def close(self):
+                pass
+
+        class FakePyAudio:
+            def open(self, **kwargs):
+                self.stream = FakeStream(kwargs['stream_callback'])
+                return self.stream
+
+            def terminate(self):
+                pass
+
+        real_pyaudio = recording_service.pyaudio.PyAudio
+        recording_service.pyaudio.PyAudio = FakePyAudio
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                # 8 kHz mono keeps the in-memory buffer at 160 KB, so 100 chunks spill it
+                service = RecordingService(sample_rate=8000, chunk_size=1024)
+                chunks = [bytes([i % 256]) * 2048 for i in range(100)]
+
+                path = str(Path(tmp) / "session.wav")
+                service.start_recording(path)
+                for chunk in chunks:
+                    service.stream.callback(chunk, 1024, None, 0)
+                    while service._capture_q.qsize() > CAPTURE_QUEUE_CHUNKS // 2:
+                        time.sleep(0.001)  # Stay ahead of the drop-oldest policy
+                assert service.stop_recording() == path
+                assert service.xruns == 0
+
+                with wave.open(path, 'rb') as wf:
+                    assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (1, 2, 8000)
+                    assert wf.readframes(wf.getnframes()) == b''.join(chunks)
+
+                # A stalled writer makes the callback drop the oldest chunks
+                release = threading.Event()
+                path = str(Path(tmp) / "stalled.wav")
+                service.start_recording(path, callback=lambda data: release.wait())
+                for chunk in chunks[:CAPTURE_QUEUE_CHUNKS + 10]:
+                    service.stream.callback(chunk, 1024, None, 0)
+                assert service.xruns > 0
+                release.set()
+                service.stop_recording()
+                with wave.open(path, 'rb') as wf:
+                    assert wf.getnframes() == (CAPTURE_QUEUE_CHUNKS + 10 - service.xruns) * 1024
+
+                # Nothing captured leaves no file behind
+                path = Path(tmp) / "empty.wav"
+                service.start_recording(str(path))
+                assert service.stop_recording() is None
+                assert not path.exists()
+        finally:
+            recording_service.pyaudio.PyAudio = real_pyaudio
+
+        print("✓ Recording capture test successful")
+    except Exception as e:
+        print(f"✗ Recording capture test failed: {e}")
+        assert False, f"Recording capture test failed: {e}"
+
+def test_transcript_display():
+    """Test that the transcript view renders each segment once, whatever the speaker value"""
+    try:
+        from types import SimpleNamespace
+        from ui.gui import GUIInterface
+
+        inserted = []
+        app = SimpleNamespace(transcription_service=SimpleNamespace(ensure_loaded=lambda: None))
+        gui = GUIInterface(app)
+        gui._tk = SimpleNamespace(END='end')
+        gui.output_text = SimpleNamespace(delete=lambda *a: inserted.clear(),
+                                          insert=lambda index, text: inserted.append(text))
+
+        gui._display_transcript({'segments': [
+            {'speaker': 'Alice', 'text': '  Roll initiative. '},
+            {'speaker': None, 'text': 'Who said that?'},
+            {'speaker': 2, 'text': 'Me.'},
+            {'text': '   '},
+            {'text': 'Anyone?'}
+        ]})
+        assert inserted == [
+            "[Alice]: Roll initiative.\n[None]: Who said that?\n[2]: Me.\n[Unknown]: Anyone?\n"
+        ]
+        gui._jobs.put(None)
+
+        print("✓ Transcript display test successful")
+    except Exception as e:
+        print(f"✗ Transcript display test failed: {e}")
+        assert False, f"Transcript display test failed: {e}"
+
 if __name__ == "__main__":
-    # Run tests manually if called directly
+    # Run tests manually if called directly; pytest gets src from pytest.ini
+    src_path = str(Path(__file__).parent.parent / "src")
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
+
     print("Running Tabletop Notetaker tests...\n")
 
     test_core_imports()
@@ -114,5 +693,22 @@ if __name__ == "__main__":
     test_gui_import()
     test_services_initialization()
     test_summarization_functionality()
+    test_action_item_detection()
+    test_speaker_order()
+    test_transcript_file_parsing()
+    test_incremental_summary()
+    test_speech_segmentation()
+    test_quiet_audio_chunks()
+    test_transcription_cancel()
+    test_keyword_tokenizer()
+    test_transcript_cache()
+    test_summary_cache()
+    test_transcribe_and_summarize()
+    test_live_transcription_default()
+    test_app_close()
+    test_gui_update_pump()
+    test_gui_transcript_loading()
+    test_recording_capture()
+    test_transcript_display()
 
     print("\n✅ All tests completed!")